@@ -49,3 +49,15 @@ USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTM
 HEADLESS_BROWSER = True
 BROWSER_TIMEOUT = int(os.getenv('BROWSER_TIMEOUT', '30'))
 
+
+# Optional JSON search endpoints (the stores' own XHR APIs), tried with plain HTTP
+# before launching a browser. "{query}" is replaced by the URL-quoted search term.
+# Leave empty to always render search pages with Selenium.
+METRO_SEARCH_API_URL = os.getenv('METRO_SEARCH_API_URL', '')
+SOBEYS_SEARCH_API_URL = os.getenv('SOBEYS_SEARCH_API_URL', '')
+
+# On-disk cache of rendered pages, keyed by (store, url). Identical searches within
+# the TTL skip the browser; set PAGE_CACHE_TTL_SECONDS=0 to always fetch live.
+PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', '.page_cache')
+PAGE_CACHE_TTL_SECONDS = int(os.getenv('PAGE_CACHE_TTL_SECONDS', '3600'))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv('PAGE_CACHE_MAX_ENTRIES', '2000'))
@@ -1,14 +1,15 @@
 """
 Google Sheets uploader module for automatically uploading new products
 """
-import gspread
 from google.oauth2.credentials import Credentials as OAuthCredentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-import os
-import pickle
 import logging
 from typing import List, Dict, Set
+from utils.gsheets_client import (
+    cached_credentials, remember_credentials, get_client, load_token, save_token,
+    with_quota_retry, UPLOAD_CHUNK_ROWS, rows_for,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,6 @@ SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 SPREADSHEET_ID = '1gQ78uBRQPYOavjxp4yMpTXxXBQmKY3eoSCUaHC4Ntzg'
 SHEET_NAME = 'Products'
 CREDENTIALS_FILE = 'client_secret_1043911085470-45uf75uncmrvpdlfkvaih6kq05laqjmp.apps.googleusercontent.com.json'
-TOKEN_FILE = 'token.pickle'
 
 # Cache for already uploaded products (to avoid duplicates)
 _uploaded_products_cache: Set[str] = set()
@@ -27,15 +27,15 @@ _cache_initialized = False
 
 def get_credentials():
     """Get OAuth credentials"""
-    creds = None
+    creds = cached_credentials(CREDENTIALS_FILE, SCOPES)
+    if creds:
+        return creds
     
     # Load existing token if available
-    if os.path.exists(TOKEN_FILE):
-        try:
-            with open(TOKEN_FILE, 'rb') as token:
-                creds = pickle.load(token)
-        except Exception as e:
-            logger.warning(f"Could not load existing token: {str(e)}")
+    try:
+        creds = load_token()
+    except Exception as e:
+        logger.warning(f"Could not load existing token: {str(e)}")
     
     # If no valid credentials, get new ones
     if not creds or not creds.valid:
@@ -53,11 +53,11 @@ def get_credentials():
         
         # Save token for next time
         try:
-            with open(TOKEN_FILE, 'wb') as token:
-                pickle.dump(creds, token)
+            save_token(creds)
         except Exception as e:
             logger.warning(f"Could not save token: {str(e)}")
     
+    remember_credentials(CREDENTIALS_FILE, SCOPES, creds)
     return creds
 
 def initialize_uploaded_products_cache():
@@ -73,7 +73,7 @@ def initialize_uploaded_products_cache():
             _cache_initialized = True
             return
         
-        client = gspread.authorize(creds)
+        client = get_client(creds)
         spreadsheet = client.open_by_key(SPREADSHEET_ID)
         worksheet = spreadsheet.worksheet(SHEET_NAME)
         
@@ -125,32 +125,18 @@ def upload_new_products_to_sheets(new_products: List[Dict], spreadsheet_id: str
             return 0
         
         # Connect to Google Sheets
-        client = gspread.authorize(creds)
+        client = get_client(creds)
         spreadsheet = client.open_by_key(spreadsheet_id)
         worksheet = spreadsheet.worksheet(sheet_name)
         
         # Prepare rows
-        rows = []
-        for product in products_to_upload:
-            row = [
-                product.get('product_name', ''),
-                'Yes' if product.get('found') else 'No',
-                product.get('walmart_product_name', ''),
-                product.get('walmart_price', ''),
-                product.get('walmart_brand', ''),
-                product.get('walmart_size', ''),
-                'Yes' if product.get('walmart_in_stock') else 'No',
-                product.get('walmart_url', ''),
-                product.get('scraped_at', '')
-            ]
-            rows.append(row)
+        rows = rows_for(products_to_upload)
         
-        # Upload in batches
-        batch_size = 100
+        # Upload in one request (UPLOAD_CHUNK_ROWS rows per request for huge batches)
         uploaded = 0
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i:i+batch_size]
-            worksheet.append_rows(batch)
+        for i in range(0, len(rows), UPLOAD_CHUNK_ROWS):
+            batch = rows[i:i + UPLOAD_CHUNK_ROWS]
+            with_quota_retry(worksheet.append_rows, batch)
             uploaded += len(batch)
         
         logger.info(f"📊 Uploaded {uploaded} new products to Google Sheets")
@@ -8,6 +8,15 @@ from typing import Optional, Dict, Any
 class Product:
     """Represents a grocery product from any source with full details"""
     
+    # Fixed attribute set: no per-instance __dict__, so tens of products per
+    # search are smaller and quicker to build
+    __slots__ = (
+        'name', 'price', 'original_price', 'sale_price', 'is_on_sale',
+        'image_url', 'product_url', 'description', 'brand', 'size', 'unit',
+        'category', 'master_category', 'main_category', 'category_2nd',
+        'category_3rd', 'sku', 'in_stock', 'source', 'scraped_at',
+    )
+    
     def __init__(
         self,
         name: str,
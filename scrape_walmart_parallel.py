@@ -16,6 +16,8 @@ from datetime import datetime
 from typing import List, Dict, Set
 from queue import Queue
 from scrapers.walmart_scraper import WalmartScraper
+from scrapers.base_scraper import enable_driver_warm_pool, shutdown_driver_warm_pool
+from utils.json_loader import COMPRESSION_AVAILABLE, JSON_SUFFIXES, ZSTD_SUFFIX, compress_copy, load_json
 
 # Optional Google Sheets integration
 try:
@@ -47,6 +49,9 @@ json_lock = threading.Lock()
 queue_lock = threading.Lock()
 retry_queue_lock = threading.Lock()
 
+# Product pages that gave no usable details this run (not retried)
+detail_miss_urls: Set[str] = set()
+
 # Retry queue file
 RETRY_QUEUE_FILE = 'retry_queue.json'
 MAX_RETRY_ATTEMPTS = 3
@@ -58,6 +63,10 @@ def load_products_from_spreadsheet(file_path: str) -> pd.DataFrame:
     logger.info(f"Loaded {len(df)} products from spreadsheet")
     return df
 
+def count_found(results: List[Dict]) -> int:
+    """Count results flagged as found"""
+    return sum(1 for r in results if r.get('found'))
+
 def load_row_numbers_from_file(row_numbers_file: str) -> set:
     """Load row numbers from a text file"""
     row_numbers = set()
@@ -102,18 +111,16 @@ def load_existing_results(output_file: str) -> List[Dict]:
                 if os.path.exists(backup_dir):
                     backup_files = sorted(
                         [f for f in os.listdir(backup_dir) 
-                         if f.startswith(os.path.splitext(os.path.basename(output_file))[0]) and f.endswith('.json')],
+                         if f.startswith(os.path.splitext(os.path.basename(output_file))[0]) and f.endswith(JSON_SUFFIXES)],
                         reverse=True
                     )
                     if backup_files:
                         latest_backup = os.path.join(backup_dir, backup_files[0])
                         logger.warning(f"Attempting to load from backup: {latest_backup}")
                         try:
-                            with open(latest_backup, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                products = data.get('products', [])
-                                logger.warning(f"Loaded {len(products)} products from backup instead!")
-                                return products
+                            products = load_json(latest_backup).get('products', [])
+                            logger.warning(f"Loaded {len(products)} products from backup instead!")
+                            return products
                         except:
                             pass
                 return []
@@ -140,13 +147,17 @@ def create_backup(output_file: str, max_backups: int = 20):
             name_without_ext = os.path.splitext(base_name)[0]
             backup_file = os.path.join(backup_dir, f"{name_without_ext}_backup_{timestamp}.json")
             
-            # Copy file to backup
-            shutil.copy2(output_file, backup_file)
+            # Copy file to backup, compressed with zstd when zstandard is installed
+            if COMPRESSION_AVAILABLE:
+                backup_file += ZSTD_SUFFIX
+                compress_copy(output_file, backup_file)
+            else:
+                shutil.copy2(output_file, backup_file)
             logger.info(f"📦 Backup created: {backup_file}")
             
             # Clean up old backups (keep only last max_backups)
             backup_files = sorted(
-                [f for f in os.listdir(backup_dir) if f.startswith(name_without_ext) and f.endswith('.json')],
+                [f for f in os.listdir(backup_dir) if f.startswith(name_without_ext) and f.endswith(JSON_SUFFIXES)],
                 reverse=True
             )
             for old_backup in backup_files[max_backups:]:
@@ -162,8 +173,11 @@ def create_backup(output_file: str, max_backups: int = 20):
         logger.error(f"Error creating backup: {str(e)}")
     return None
 
-def save_results_thread_safe(results: List[Dict], output_file: str):
-    """Thread-safe function to save results to JSON file with automatic backup"""
+def save_results_thread_safe(results: List[Dict], output_file: str) -> bool:
+    """Thread-safe function to save results to JSON file with automatic backup.
+
+    Returns whether the results were written.
+    """
     with json_lock:
         try:
             # Create backup before overwriting (only if file exists and has content)
@@ -191,16 +205,14 @@ def save_results_thread_safe(results: List[Dict], output_file: str):
                 if os.path.exists(backup_dir):
                     backup_files = sorted(
                         [f for f in os.listdir(backup_dir) 
-                         if f.startswith(os.path.splitext(os.path.basename(output_file))[0]) and f.endswith('.json')],
+                         if f.startswith(os.path.splitext(os.path.basename(output_file))[0]) and f.endswith(JSON_SUFFIXES)],
                         reverse=True
                     )
                     if backup_files:
                         latest_backup = os.path.join(backup_dir, backup_files[0])
                         try:
-                            with open(latest_backup, 'r', encoding='utf-8') as f:
-                                backup_data = json.load(f)
-                                existing_results = backup_data.get('products', [])
-                                logger.warning(f"✅ Recovered {len(existing_results)} products from backup: {latest_backup}")
+                            existing_results = load_json(latest_backup).get('products', [])
+                            logger.warning(f"✅ Recovered {len(existing_results)} products from backup: {latest_backup}")
                         except Exception as e:
                             logger.error(f"Failed to load from backup: {str(e)}")
                 
@@ -208,7 +220,7 @@ def save_results_thread_safe(results: List[Dict], output_file: str):
                 if len(existing_results) == 0 and existing_count_before > 0:
                     logger.error(f"❌ ABORTING SAVE to prevent data loss! File had {existing_count_before} products but cannot load them!")
                     logger.error("❌ Please check the file manually or restore from backup!")
-                    return
+                    return False
             
             # Create a dictionary to avoid duplicates (by product_name)
             results_dict = {r.get('product_name'): r for r in existing_results}
@@ -229,13 +241,13 @@ def save_results_thread_safe(results: List[Dict], output_file: str):
             # Final safety check: ensure we're not losing data
             if original_dict_size > 0 and len(all_results) < original_dict_size:
                 logger.error(f"⚠️ WARNING: Would lose {original_dict_size - len(all_results)} products! Aborting save!")
-                return
+                return False
             
             # Save to file
             output_data = {
                 'scraped_at': datetime.now().isoformat(),
                 'total_products': len(all_results),
-                'products_found': sum(1 for r in all_results if r.get('found')),
+                'products_found': count_found(all_results),
                 'products': all_results
             }
             
@@ -251,10 +263,10 @@ def save_results_thread_safe(results: List[Dict], output_file: str):
                 os.rename(temp_file, output_file)
             
             logger.info(f"✅ Saved {len(results)} products ({new_count} new) to {output_file} (Total: {len(all_results)})")
+            return True
         except Exception as e:
-            logger.error(f"❌ Error saving results: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error(f"❌ Error saving results: {str(e)}", exc_info=True)
+            return False
 
 def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_results: int = 20) -> Dict:
     """Search Walmart for a specific product and return best match (lowest price if multiple matches)"""
@@ -366,9 +378,14 @@ def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_r
                 best_product, match_ratio, _ = same_ratio_products[0]
                 logger.info(f"Selected lowest price from {len(same_ratio_products)} similar matches: {best_product.name[:60]} - ${best_product.price if best_product.price else 'N/A'}")
         
-        # ALWAYS try to fetch full details from product page
-        # This is critical - the details page has more accurate data
-        if best_product.product_url:
+        # Fetch full details from the product page only when the search tile
+        # lacks a usable price or image (tiles never carry a description), and
+        # not for a page that already failed to give details this run. Tiles
+        # carry no stock status, so without the page it is left unknown
+        needs_details = (not best_product.price or best_product.price < 1.0
+                         or not best_product.image_url)
+        details_loaded = False
+        if needs_details and best_product.product_url and best_product.product_url not in detail_miss_urls:
             logger.info(f"🔍 Scraping full product details from page: {best_product.name[:50]}")
             logger.info(f"   URL: {best_product.product_url}")
             try:
@@ -380,10 +397,11 @@ def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_r
                     # Check if URL shows blocked
                     if scraper.driver:
                         check_url = scraper.driver.current_url
-                        if "blocked" in check_url.lower():
+                        if scraper._is_blocked_url(check_url):
                             logger.warning(f"⚠ Actually blocked when scraping product page, skipping product entirely")
                             return None
                     # Not actually blocked, just failed to parse - use search result data
+                    detail_miss_urls.add(best_product.product_url)
                     logger.warning(f"⚠ Could not extract details from product page (not blocked), using search result data")
                     logger.info(f"   Search result - Name: {best_product.name[:50]}, Price: ${best_product.price}")
                 else:
@@ -391,10 +409,12 @@ def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_r
                     if detailed and detailed.name and detailed.name != 'Unknown Product' and len(detailed.name) > 3:
                         # Prefer detailed product - it has more complete data
                         best_product = detailed
+                        details_loaded = True
                         logger.info(f"✓✓ Successfully scraped complete details: ${best_product.price} - {best_product.name[:50]}")
                     elif detailed and detailed.name and len(detailed.name) > 3:
                         # We got a name but maybe missing price - still use it
                         best_product = detailed
+                        details_loaded = True
                         logger.info(f"✓ Scraped details (price may be missing): {best_product.name[:50]}")
                     elif detailed and detailed.price:
                         # If we got price from details page, update search result
@@ -405,13 +425,12 @@ def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_r
                             best_product.size = detailed.size
                         if detailed.in_stock is not None:
                             best_product.in_stock = detailed.in_stock
+                        details_loaded = True
                         logger.info(f"✓ Updated with details page data: ${best_product.price}")
                     else:
                         logger.warning(f"⚠ Detailed product returned but invalid, using search result data")
             except Exception as e:
-                logger.error(f"❌ Exception scraping details: {str(e)}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
+                logger.error(f"❌ Exception scraping details: {str(e)}", exc_info=True)
                 logger.warning(f"   Using search result data instead")
         
         # Ensure we have at least basic data - but be more lenient
@@ -438,16 +457,14 @@ def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_r
             'walmart_product_name': best_product.name,
             'walmart_brand': best_product.brand,
             'walmart_size': best_product.size,
-            'walmart_in_stock': best_product.in_stock,
+            'walmart_in_stock': best_product.in_stock if details_loaded else None,  # None: unknown
             'scraped_at': datetime.now().isoformat()
         }
         logger.info(f"✅ Result dict created: found={result_dict.get('found')}, price={result_dict.get('walmart_price')}")
         return result_dict
         
     except Exception as e:
-        logger.error(f"❌ [EXCEPTION] Error searching for {product_name}: {str(e)}")
-        import traceback
-        logger.error(f"❌ [TRACEBACK]: {traceback.format_exc()}")
+        logger.error(f"❌ [EXCEPTION] Error searching for {product_name}: {str(e)}", exc_info=True)
         # Check if it's a session error - if so, return None to trigger browser recreation
         error_str = str(e).lower()
         if 'invalid session' in error_str or 'session' in error_str or 'no such window' in error_str:
@@ -464,49 +481,107 @@ def search_walmart_for_product(scraper: WalmartScraper, product_name: str, max_r
             'scraped_at': datetime.now().isoformat()
         }
 
+def journal_path(output_file: str) -> str:
+    """Path of the JSONL journal results are appended to during a run"""
+    return output_file + '.jsonl'
+
+def append_results_journal(fd: int, results: List[Dict]) -> bool:
+    """Append a batch of results to the JSONL journal, normally in a single write.
+
+    The fd is opened with O_APPEND, so the batch lands at the end of the file
+    without a lock. Returns False if the batch could not be written in full.
+    """
+    if not results:
+        return True
+    buf = memoryview(''.join(json.dumps(r, default=str) + '\n' for r in results).encode('utf-8'))
+    try:
+        while buf:
+            buf = buf[os.write(fd, buf):]
+    except OSError as e:
+        logger.warning(f"Could not append {len(results)} products to journal: {str(e)}")
+        return False
+    return True
+
+def flush_results(buffer: List[Dict], output_file: str, journal_fd: int):
+    """Journal the buffered results; save them straight to the JSON snapshot
+    only when the journal write failed"""
+    if not append_results_journal(journal_fd, buffer):
+        save_results_thread_safe(buffer, output_file)
+
+def merge_results_journal(output_file: str, remove: bool = True):
+    """Fold the JSONL journal into the JSON snapshot with one save.
+
+    The journal is deleted once the snapshot holds its results. If the save
+    fails (or remove is False) it is kept and replayed by the next merge,
+    which is harmless since results are keyed by product name.
+    """
+    path = journal_path(output_file)
+    results = []
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except ValueError:
+                    continue  # torn line from an interrupted write
+    except FileNotFoundError:
+        return
+    if results:
+        logger.info(f"Merging {len(results)} journaled products into {output_file}")
+        if not save_results_thread_safe(results, output_file):
+            return
+    if remove:
+        os.remove(path)
+
 def queue_manager(queue: Queue, output_file: str, flush_size: int = 5):
     """Manages the result queue and flushes when it reaches flush_size"""
     buffer = []
+    journal_fd = os.open(journal_path(output_file), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
     
-    while True:
-        try:
-            # Get result from queue (with timeout to check if we should exit)
+    try:
+        while True:
             try:
-                result = queue.get(timeout=1)
-            except:
-                # If queue is empty and we have items in buffer, flush them
-                if buffer:
-                    logger.info(f"Flushing {len(buffer)} products from buffer...")
-                    save_results_thread_safe(buffer, output_file)
+                # Get result from queue (with timeout to check if we should exit)
+                try:
+                    result = queue.get(timeout=1)
+                except:
+                    # If queue is empty and we have items in buffer, flush them
+                    if buffer:
+                        logger.info(f"Flushing {len(buffer)} products from buffer...")
+                        flush_results(buffer, output_file, journal_fd)
+                        buffer = []
+                    continue
+                
+                # Check if it's a stop signal
+                if result is None:
+                    # Flush remaining buffer before stopping
+                    if buffer:
+                        logger.info(f"Final flush: {len(buffer)} products")
+                        flush_results(buffer, output_file, journal_fd)
+                        buffer = []
+                    break
+                
+                # Add to buffer
+                buffer.append(result)
+                
+                # Flush when buffer reaches flush_size
+                if len(buffer) >= flush_size:
+                    logger.info(f"Queue reached {flush_size} products, flushing...")
+                    flush_results(buffer, output_file, journal_fd)
                     buffer = []
-                continue
-            
-            # Check if it's a stop signal
-            if result is None:
-                # Flush remaining buffer before stopping
+                
+                queue.task_done()
+                
+            except Exception as e:
+                logger.error(f"Error in queue manager: {str(e)}")
+                # Save buffer immediately on error to prevent data loss
                 if buffer:
-                    logger.info(f"Final flush: {len(buffer)} products")
-                    save_results_thread_safe(buffer, output_file)
+                    flush_results(buffer, output_file, journal_fd)
                     buffer = []
-                break
-            
-            # Add to buffer
-            buffer.append(result)
-            
-            # Flush when buffer reaches flush_size
-            if len(buffer) >= flush_size:
-                logger.info(f"Queue reached {flush_size} products, flushing...")
-                save_results_thread_safe(buffer, output_file)
-                buffer = []
-            
-            queue.task_done()
-            
-        except Exception as e:
-            logger.error(f"Error in queue manager: {str(e)}")
-            # Save buffer immediately on error to prevent data loss
-            if buffer:
-                save_results_thread_safe(buffer, output_file)
-                buffer = []
+    finally:
+        os.close(journal_fd)
+        # The snapshot is rebuilt once per run instead of once per flush
+        merge_results_journal(output_file)
 
 def worker_thread(worker_id: int, product_queue: Queue, result_queue: Queue, output_file: str, retry_queue: Dict[str, int] = None):
     """Worker thread that processes products"""
@@ -610,9 +685,7 @@ def worker_thread(worker_id: int, product_queue: Queue, result_queue: Queue, out
                         add_to_retry_queue(product_name, retry_queue, retry_queue_lock)
                 
             except Exception as e:
-                logger.error(f"[Worker {worker_id}] Error processing {product_name}: {str(e)}")
-                import traceback
-                logger.error(f"[Worker {worker_id}] Traceback: {traceback.format_exc()}")
+                logger.error(f"[Worker {worker_id}] Error processing {product_name}: {str(e)}", exc_info=True)
                 # Don't add error results to queue - only save found products
                 logger.info(f"[Worker {worker_id}] Error result not saved (only found products are saved)")
             finally:
@@ -636,9 +709,14 @@ def scrape_parallel(
     row_numbers_file: str = None,
     num_workers: int = 2,
     output_file: str = 'walmart_scraped_products_20260109_074637.json',
-    flush_size: int = 5
+    flush_size: int = 5,
+    warm_drivers: bool = False
 ):
-    """Scrape products in parallel with multiple Chrome browsers"""
+    """Scrape products in parallel with multiple Chrome browsers
+
+    With warm_drivers, spare browsers are kept pre-started so a worker that
+    gets blocked can swap one in instead of waiting for a cold Chrome start.
+    """
     
     logger.info("=" * 70)
     logger.info("PARALLEL WALMART SCRAPER")
@@ -646,9 +724,11 @@ def scrape_parallel(
     logger.info(f"Workers (Chrome browsers): {num_workers}")
     logger.info(f"Queue flush size: {flush_size}")
     logger.info(f"Output file: {output_file}")
+    logger.info(f"Warm driver pool: {'on' if warm_drivers else 'off'}")
     logger.info("=" * 70)
     
-    # Load existing results
+    # Load existing results, including any an interrupted run only journaled
+    merge_results_journal(output_file)
     existing_results = load_existing_results(output_file)
     existing_product_names = {p.get('product_name') for p in existing_results if p.get('product_name')}
     logger.info(f"Existing results: {len(existing_results)} products")
@@ -675,8 +755,10 @@ def scrape_parallel(
             df = df.iloc[[i for i in range(len(df)) if (i + 1) in row_numbers]].copy()
             logger.info(f"Filtered to {len(df)} rows based on row numbers file")
     
-    # Get product names
-    product_names = df['Product'].unique().tolist()
+    # Get unique product names in spreadsheet order (factorize hashes the
+    # column once and skips empty cells)
+    _, product_uniques = pd.factorize(df['Product'])
+    product_names = product_uniques.tolist()
     
     # Filter out already processed products
     original_count = len(product_names)
@@ -700,6 +782,9 @@ def scrape_parallel(
             save_retry_queue(retry_queue)
         return
     
+    if warm_drivers:
+        enable_driver_warm_pool()
+    
     # Create queues
     product_queue = Queue()
     result_queue = Queue()
@@ -755,7 +840,7 @@ def scrape_parallel(
     logger.info("=" * 70)
     logger.info(f"Total products processed: {len(product_names)}")
     logger.info(f"Total products in {output_file}: {len(final_results)}")
-    logger.info(f"Products found: {sum(1 for r in final_results if r.get('found'))}")
+    logger.info(f"Products found: {count_found(final_results)}")
     logger.info("=" * 70)
     
     # Retry blocked products
@@ -814,7 +899,7 @@ def scrape_parallel(
             logger.info("RETRY COMPLETE!")
             logger.info("=" * 70)
             logger.info(f"Total products after retry: {len(final_results_after_retry)}")
-            logger.info(f"Products found: {sum(1 for r in final_results_after_retry if r.get('found'))}")
+            logger.info(f"Products found: {count_found(final_results_after_retry)}")
             
             # Show remaining retry queue
             remaining_retries = get_retry_queue_products(retry_queue)
@@ -827,6 +912,9 @@ def scrape_parallel(
                 save_retry_queue(retry_queue)
             logger.info("=" * 70)
     
+    if warm_drivers:
+        shutdown_driver_warm_pool()
+    
     # Upload new products to Google Sheets when scraper stops
     if GOOGLE_SHEETS_ENABLED:
         try:
@@ -840,9 +928,7 @@ def scrape_parallel(
             else:
                 logger.info("ℹ️ No new products to upload (all already in Google Sheets)")
         except Exception as e:
-            logger.error(f"❌ Error uploading to Google Sheets: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error(f"❌ Error uploading to Google Sheets: {str(e)}", exc_info=True)
 
 if __name__ == '__main__':
     import argparse
@@ -858,9 +944,12 @@ if __name__ == '__main__':
         global _should_upload_on_exit, _output_file_global
         logger.info("\n\n⚠️ Scraper interrupted by user (Ctrl+C)")
         logger.info("Saving data and uploading to Google Sheets...")
+        shutdown_driver_warm_pool()
         
         if _output_file_global and GOOGLE_SHEETS_ENABLED:
             try:
+                # The queue manager may still be appending, so keep the journal
+                merge_results_journal(_output_file_global, remove=False)
                 final_results = load_existing_results(_output_file_global)
                 logger.info(f"📊 Uploading {len(final_results)} products to Google Sheets...")
                 initialize_uploaded_products_cache()
@@ -887,6 +976,8 @@ if __name__ == '__main__':
                        help='Number of products to queue before flushing to JSON')
     parser.add_argument('--output-file', type=str, default='walmart_scraped_products_20260109_074637.json',
                        help='Output file to save results')
+    parser.add_argument('--warm-drivers', action='store_true',
+                       help='Keep spare pre-started Chrome browsers for fast recovery when blocked')
     
     args = parser.parse_args()
     _output_file_global = args.output_file
@@ -897,7 +988,8 @@ if __name__ == '__main__':
             row_numbers_file=args.row_numbers_file,
             num_workers=args.workers,
             output_file=args.output_file,
-            flush_size=args.flush_size
+            flush_size=args.flush_size,
+            warm_drivers=args.warm_drivers
         )
     except KeyboardInterrupt:
         # This will be handled by signal_handler, but just in case
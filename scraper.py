@@ -2,6 +2,7 @@
 Main scraper script with scheduling support
 """
 import argparse
+import asyncio
 import logging
 import sys
 import time
@@ -11,7 +12,8 @@ from typing import List, Optional
 
 import schedule
 
-from scrapers.store_registry import get_scraper, get_all_store_names, STORE_SCRAPERS
+from scrapers.base_scraper import ASYNC_SEARCH_AVAILABLE
+from scrapers.store_registry import get_scraper, close_all, get_all_store_names, search_all, STORE_SCRAPERS
 from database.mongodb_handler import MongoDBHandler
 from config import SCRAPE_INTERVAL_HOURS, DEFAULT_STORES
 from models.product import Product
@@ -99,15 +101,27 @@ class GroceryScraper:
             logger.info("=" * 50)
             
             store_products = []
-            for query in search_queries:
+            if scraper.SUPPORTS_ASYNC_SEARCH and ASYNC_SEARCH_AVAILABLE:
+                # Render the search pages a couple at a time in one headless browser
+                logger.info(f"Searching {store_name} for {len(search_queries)} queries concurrently")
                 try:
-                    logger.info(f"Searching {store_name} for: {query}")
-                    products = scraper.search_products(query, max_results=10)
+                    by_query = asyncio.run(scraper.search_many_async(search_queries, max_results=10, concurrency=2))
+                except Exception as e:
+                    logger.error(f"Error scraping {store_name}: {str(e)}")
+                    by_query = {}
+                for query, products in by_query.items():
                     store_products.extend(products)
                     logger.info(f"Found {len(products)} products for '{query}' on {store_name}")
-                    time.sleep(2)  # Be respectful with delays
-                except Exception as e:
-                    logger.error(f"Error scraping {store_name} for '{query}': {str(e)}")
+            else:
+                for query in search_queries:
+                    try:
+                        logger.info(f"Searching {store_name} for: {query}")
+                        products = scraper.search_products(query, max_results=10)
+                        store_products.extend(products)
+                        logger.info(f"Found {len(products)} products for '{query}' on {store_name}")
+                        time.sleep(2)  # Be respectful with delays
+                    except Exception as e:
+                        logger.error(f"Error scraping {store_name} for '{query}': {str(e)}")
             
             results[store_name]['count'] = len(store_products)
             results[store_name]['products'] = [p.to_dict() for p in store_products]
@@ -151,17 +165,14 @@ class GroceryScraper:
         for store_name in self.stores:
             results[store_name] = {'count': 0, 'products': []}
         
-        # Search all stores
-        for store_name, scraper in self.scrapers.items():
-            try:
-                logger.info(f"Searching {store_name} for: {product_name}")
-                store_products = scraper.search_products(product_name, max_results=max_results_per_store)
-                results[store_name]['count'] = len(store_products)
-                results[store_name]['products'] = [p.to_dict() for p in store_products]
-                all_products.extend(store_products)
-                logger.info(f"Found {len(store_products)} products on {store_name}")
-            except Exception as e:
-                logger.error(f"Error searching {store_name}: {str(e)}")
+        # Search all stores side by side, one thread per store (a failing store gets [])
+        by_store = search_all(product_name, max_results=max_results_per_store,
+                              store_names=list(self.scrapers))
+        for store_name, store_products in by_store.items():
+            results[store_name] = {'count': len(store_products),
+                                   'products': [p.to_dict() for p in store_products]}
+            all_products.extend(store_products)
+            logger.info(f"Found {len(store_products)} products on {store_name}")
         
         results['total'] = len(all_products)
         
@@ -189,11 +200,9 @@ class GroceryScraper:
     
     def cleanup(self):
         """Clean up resources"""
-        for store_name, scraper in self.scrapers.items():
-            try:
-                scraper.cleanup()
-            except Exception as e:
-                logger.error(f"Error cleaning up {store_name} scraper: {str(e)}")
+        # The scrapers are the registry's shared instances, so shut them down there
+        close_all()
+        self.scrapers = {}
         
         if self.db_handler:
             self.db_handler.close()
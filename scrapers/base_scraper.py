@@ -2,61 +2,289 @@
 Base scraper class with common functionality
 Uses undetected-chromedriver to avoid bot detection
 """
+import re
+import sys
 import time
+import asyncio
 import logging
+import queue
+import threading
+import fnmatch
+import functools
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit, urlunsplit, quote
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import soupsieve as sv
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+# Whether search_many_async can run here
+ASYNC_SEARCH_AVAILABLE = async_playwright is not None
+
+try:
+    import lxml  # noqa: F401 - C-backed tree builder for BeautifulSoup
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 from config import USER_AGENT, REQUEST_DELAY_SECONDS, HEADLESS_BROWSER, BROWSER_TIMEOUT
 from models.product import Product
+from scrapers.page_cache import page_cache
 
 logger = logging.getLogger(__name__)
 
+# URLs are ASCII, so checking the common spellings avoids lower()-copying every URL
+_BLOCKED_TOKENS = ('blocked', 'Blocked', 'BLOCKED')
+
+# Page-content phrases that indicate a bot-detection interstitial
+_BOT_WARNING_PHRASES = (
+    "robot",
+    "captcha",
+    "not robots",
+    "verify your identity",
+    "press & hold",
+    "press and hold",
+    "we like real shoppers",
+)
+
+# First word of a product name when it is at least 3 characters (brand fallback)
+_FIRST_WORD_RE = re.compile(r'\s*(\S{3,})')
+
+# URLs that are already absolute; protocol-relative "//host" ones still need a scheme
+_ABSOLUTE_URL_PREFIXES = ('http://', 'https://')
+
+# Lazy images the page has not loaded yet. Each poll of _lazy_images_loaded
+# scrolls the next one into view so its IntersectionObserver fires
+_PENDING_LAZY_IMAGES = 'img[data-src]:not([src]), img[data-lazy-src]:not([src])'
+_SCROLL_TO_LAZY_IMAGE_JS = (
+    "const img = document.querySelector(arguments[0]);"
+    "if (img) img.scrollIntoView({block: 'center'});"
+    "return !!img;"
+)
+# Upper bound on waiting for lazy images after a page load
+LAZY_IMAGE_TIMEOUT_SECONDS = 3
+
+
+def _lazy_images_loaded(driver) -> bool:
+    """Wait condition: no lazy image is still waiting for its src"""
+    return not driver.execute_script(_SCROLL_TO_LAZY_IMAGE_JS, _PENDING_LAZY_IMAGES)
+
+
+# Product pages kept per scraper by cached_product_details (least recently used evicted)
+DETAIL_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=4096)
+def _join(base: str, path: str) -> str:
+    """urljoin memoized: product and image paths repeat across cards and pages"""
+    return urljoin(base, path)
+
+
+def cached_product_details(method):
+    """Memoize get_product_details by product URL in a per-scraper LRU cache.
+
+    Only successful lookups are cached so transient failures are retried.
+    """
+    @functools.wraps(method)
+    def wrapper(self, product_url: str):
+        product = self._cached_details(product_url)
+        if product is None:
+            product = method(self, product_url)
+            self._remember_details(product_url, product)
+        return product
+    return wrapper
+
+# Shared copies of strings that repeat across products (brands, sizes, categories)
+INTERN_CACHE_SIZE = 10000
+_interned: "OrderedDict[str, str]" = OrderedDict()
+_intern_lock = threading.Lock()
+
+
+def intern_text(value: Optional[str]) -> Optional[str]:
+    """Return one shared copy of a frequently repeated string.
+
+    Bounded LRU over sys.intern, so rarely seen values can be freed again.
+    """
+    if not value:
+        return value
+    with _intern_lock:
+        shared = _interned.get(value)
+        if shared is not None:
+            _interned.move_to_end(value)
+            return shared
+        shared = _interned[value] = sys.intern(value)
+        if len(_interned) > INTERN_CACHE_SIZE:
+            _interned.popitem(last=False)
+        return shared
+
+def card_strainer(link_fragment: str) -> SoupStrainer:
+    """SoupStrainer that only builds likely product cards from a search page.
+
+    Mirrors the product-card probes used by the grocery scrapers (product-card
+    test ids and classes, product items/articles, links containing
+    link_fragment). Everything else is skipped while parsing, so the tree
+    holds just the cards and their contents.
+    """
+    def is_card(name: str, attrs: dict) -> bool:
+        if attrs.get('data-testid') == 'product-card':
+            return True
+        css_class = attrs.get('class') or ''
+        if isinstance(css_class, list):
+            css_class = ' '.join(css_class)
+        if 'product-card' in css_class or 'ProductCard' in css_class:
+            return True
+        if name == 'div' and 'product-item' in css_class:
+            return True
+        if name == 'article' and 'product' in css_class:
+            return True
+        return name == 'a' and link_fragment in (attrs.get('href') or '')
+    return SoupStrainer(is_card)
+
+# Resources a search page never needs the bytes of: images (their URLs are read
+# from DOM attributes), fonts, stylesheets and ad/analytics trackers
+HEAVY_RESOURCE_PATTERNS = (
+    '*.jpg', '*.jpeg', '*.png', '*.webp', '*.gif', '*.woff*', '*.css',
+    '*google-analytics*', '*doubleclick*',
+)
+
+def compile_ranked(fields: Dict[str, Tuple[str, ...]]) -> Dict[Tuple[str, int], "sv.SoupSieve"]:
+    """Compile each field's fallback selectors (priority order) for BaseScraper._ranked_matches"""
+    return {
+        (field, rank): sv.compile(selector)
+        for field, selectors in fields.items()
+        for rank, selector in enumerate(selectors)
+    }
+
+# JSON keys recognised when reading products from a store's search API, in priority order
+_API_NAME_KEYS = ('name', 'productName', 'title')
+_API_PRICE_KEYS = ('price', 'currentPrice', 'salePrice', 'regularPrice')
+_API_IMAGE_KEYS = ('imageUrl', 'image', 'thumbnail')
+_API_URL_KEYS = ('url', 'productUrl', 'link')
+_API_BRAND_KEYS = ('brand', 'brandName')
+
 
 class BaseScraper(ABC):
     """Base class for all scrapers"""
     
+    # Search-card field -> fallback selectors in priority order (a tuple, like an
+    # `or` chain of select_one calls) or a single selector; compiled once per
+    # subclass into _card_fields when the class is defined (see __init_subclass__)
+    CARD_SELECTORS: Dict[str, Union[str, Tuple[str, ...]]] = {}
+    _card_fields: Dict[Tuple[str, int], "sv.SoupSieve"] = {}
+    # <img> attributes holding a card's image URL, in priority order; unless
+    # CARD_SELECTORS has an 'image' entry, the image is the first img[attr] match
+    # trying the attributes in this order
+    CARD_IMAGE_ATTRS: Tuple[str, ...] = ('src', 'data-src')
+    # Shorter card names are treated as noise and skipped
+    MIN_NAME_LENGTH = 3
+    
+    # Product-card container selectors in priority order; the first one with any
+    # hits on a search page wins (see _find_product_cards)
+    CARD_PROBES: Tuple[str, ...] = ()
+    _card_probes: Tuple[Tuple[str, "sv.SoupSieve"], ...] = ()
+    
+    # URL patterns the browser is told not to download (opt-in per store,
+    # e.g. HEAVY_RESOURCE_PATTERNS); applied via Chrome DevTools on each driver
+    BLOCKED_URL_PATTERNS: Tuple[str, ...] = ()
+    
+    # JSON search endpoint with a "{query}" placeholder, tried over plain HTTP
+    # before rendering the search page (see _search_via_api); empty disables it
+    SEARCH_API_URL = ''
+    
+    # Whether search_many_async can render this store's search pages; scrapers
+    # that set it define _search_url(query) and _parse_search_page(html, max_results)
+    SUPPORTS_ASYNC_SEARCH = False
+    # Element that marks a rendered search page as ready (search_many_async)
+    SEARCH_WAIT_SELECTOR = ''
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'CARD_SELECTORS' in cls.__dict__ or 'CARD_IMAGE_ATTRS' in cls.__dict__:
+            fields = {
+                field: (selectors,) if isinstance(selectors, str) else tuple(selectors)
+                for field, selectors in cls.CARD_SELECTORS.items()
+            }
+            # The card's link and image are resolved in the same walk as its fields
+            fields['_link'] = ('a[href]',)
+            fields.setdefault('image', tuple(f'img[{attr}]' for attr in cls.CARD_IMAGE_ATTRS))
+            cls._card_fields = compile_ranked(fields)
+        if 'CARD_PROBES' in cls.__dict__:
+            cls._card_probes = tuple((selector, sv.compile(selector)) for selector in cls.CARD_PROBES)
+        if cls.SUPPORTS_ASYNC_SEARCH and not (hasattr(cls, '_search_url') and hasattr(cls, '_parse_search_page')):
+            raise TypeError(f"{cls.__name__} sets SUPPORTS_ASYNC_SEARCH without _search_url and _parse_search_page")
+    
     def __init__(self, base_url: str, source_name: str):
         self.base_url = base_url
+        # A bare origin ("https://host") lets root-relative paths skip urljoin
+        self._base_is_origin = not urlsplit(base_url).path
         self.source_name = source_name
         self.driver: Optional[uc.Chrome] = None
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': USER_AGENT})
+        # Pooled keep-alive connections for all plain-HTTP fetches of this scraper,
+        # with a couple of quick retries on connection errors
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._detail_cache: "OrderedDict[str, Product]" = OrderedDict()
+    
+    def _detail_cache_key(self, product_url: str) -> str:
+        """Detail-cache key for a product URL: host case and fragment ignored.
+
+        Stores whose query strings only carry tracking parameters override
+        this so every variant of a product URL shares one entry.
+        """
+        parts = urlsplit(product_url)
+        return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, parts.query, ''))
+    
+    def _cached_details(self, product_url: str) -> Optional[Product]:
+        """Return a cached product for product_url, marking it recently used"""
+        key = self._detail_cache_key(product_url)
+        product = self._detail_cache.get(key)
+        if product is not None:
+            self._detail_cache.move_to_end(key)
+        return product
+    
+    def _remember_details(self, product_url: str, product: Optional[Product]):
+        """Cache a successfully scraped product, evicting the least recently used"""
+        if product is None:
+            return
+        self._detail_cache[self._detail_cache_key(product_url)] = product
+        if len(self._detail_cache) > DETAIL_CACHE_SIZE:
+            self._detail_cache.popitem(last=False)
     
     def _get_driver(self) -> uc.Chrome:
         """Initialize and return an undetected Chrome WebDriver to avoid bot detection"""
         if self.driver is None:
-            options = uc.ChromeOptions()
-            
-            if HEADLESS_BROWSER:
-                options.add_argument('--headless=new')
-            else:
-                # Non-headless mode is better for avoiding detection
-                options.add_argument('--start-maximized')
-            
-            # Additional options for better stealth
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument(f'--user-agent={USER_AGENT}')
-            
-            # Use undetected-chromedriver (automatically handles bot detection)
-            self.driver = uc.Chrome(
-                options=options,
-                version_main=None,  # Auto-detect Chrome version
-                use_subprocess=True
-            )
-            self.driver.set_page_load_timeout(BROWSER_TIMEOUT)
-            
-            # Set window size
-            if not HEADLESS_BROWSER:
-                self.driver.set_window_size(1920, 1080)
-            
+            self.driver = _create_driver()
+            self._block_resources(self.driver)
             logger.info(f"Initialized undetected Chrome driver for {self.source_name}")
         return self.driver
     
+    def _block_resources(self, driver: uc.Chrome):
+        """Stop the browser fetching BLOCKED_URL_PATTERNS (best effort)"""
+        if not self.BLOCKED_URL_PATTERNS:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(self.BLOCKED_URL_PATTERNS)})
+        except Exception as e:
+            logger.debug(f"Could not block resources for {self.source_name}: {str(e)}")
+    
     def _close_driver(self):
         """Close the WebDriver"""
         if self.driver:
@@ -67,47 +295,56 @@ class BaseScraper(ABC):
             self.driver = None
     
     def _recreate_driver(self):
-        """Recreate the Chrome driver (useful when blocked)"""
+        """Recreate the Chrome driver (useful when blocked)
+
+        Swaps in a pre-warmed browser from the warm pool when one is ready,
+        otherwise falls back to a cold start.
+        """
         self._close_driver()
-        return self._get_driver()
+        try:
+            self.driver = _warm_pool.get_nowait()
+            self._block_resources(self.driver)
+            logger.info(f"Swapped in pre-warmed Chrome driver for {self.source_name}")
+            return self.driver
+        except queue.Empty:
+            return self._get_driver()
     
-    def _get_page(self, url: str, use_selenium: bool = False) -> Optional[BeautifulSoup]:
-        """Fetch a page and return BeautifulSoup object"""
+    def _fetch_html(self, url: str, use_selenium: bool = False, settle: bool = True) -> Optional[str]:
+        """Fetch a page and return its raw HTML (None if blocked or on error)
+
+        settle=False skips the extra fixed wait after a browser load, for callers
+        that wait for their own ready condition afterwards.
+        """
         try:
             if use_selenium:
                 driver = self._get_driver()
                 driver.get(url)
                 # Wait longer for page to load and avoid bot detection
-                time.sleep(REQUEST_DELAY_SECONDS + 2)
+                time.sleep(REQUEST_DELAY_SECONDS + 2 if settle else REQUEST_DELAY_SECONDS)
                 
-                # Scroll a bit to simulate human behavior
-                driver.execute_script("window.scrollTo(0, 300);")
-                time.sleep(1)
+                # Scroll only the lazy images that still lack a src into view,
+                # returning as soon as they have loaded
+                try:
+                    WebDriverWait(driver, LAZY_IMAGE_TIMEOUT_SECONDS, poll_frequency=0.25).until(
+                        _lazy_images_loaded
+                    )
+                except TimeoutException:
+                    pass
                 driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(1)
                 
                 html = driver.page_source
                 current_url = driver.current_url
                 
                 # Only skip if URL actually contains "blocked" - this means we're truly blocked
                 # Don't skip for warnings in page content, continue scraping
-                is_actually_blocked = "blocked" in current_url.lower()
-                
-                if is_actually_blocked:
+                if self._is_blocked_url(current_url):
                     logger.warning(f"Actually blocked - URL contains 'blocked': {current_url}")
                     logger.warning("Skipping this product and continuing to next...")
                     return None
                 
-                # Log warnings but continue scraping
-                has_warning = (
-                    "robot" in html.lower() or 
-                    "captcha" in html.lower() or 
-                    "not robots" in html.lower() or
-                    "verify your identity" in html.lower() or
-                    "press & hold" in html.lower() or
-                    "press and hold" in html.lower() or
-                    "we like real shoppers" in html.lower()
-                )
+                # Log warnings but continue scraping (lowercase the page only once)
+                html_lower = html.lower()
+                has_warning = any(phrase in html_lower for phrase in _BOT_WARNING_PHRASES)
                 
                 if has_warning:
                     logger.warning(f"Bot detection warning on {url} - but continuing to scrape...")
@@ -117,15 +354,382 @@ class BaseScraper(ABC):
                 response.raise_for_status()
                 html = response.text
             
-            return BeautifulSoup(html, 'html.parser')
+            return html
         except Exception as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             return None
     
+    def _get_page(self, url: str, use_selenium: bool = False, parse_only=None) -> Optional[BeautifulSoup]:
+        """Fetch a page and return BeautifulSoup object"""
+        html = self._fetch_html(url, use_selenium)
+        if html is None:
+            return None
+        return self._make_soup(html, parse_only=parse_only)
+    
+    def _fetch_settled_html(self, url: str, wait_selector: str) -> Optional[str]:
+        """Load url in the browser, wait for wait_selector, and return the page source
+
+        Settled pages are kept in the on-disk page cache, so a repeat request
+        within its TTL is answered without the browser.
+        """
+        html = page_cache.get(self.source_name, url)
+        if html is not None:
+            return html
+        html = self._fetch_html(url, use_selenium=True, settle=False)
+        if not html:
+            return None
+        settled = self._wait_for(wait_selector)
+        # Parse once, from the settled page source
+        if self.driver:
+            html = self.driver.page_source
+        # Only cache pages that actually rendered their content
+        if settled:
+            page_cache.put(self.source_name, url, html)
+        return html
+    
+    def _wait_for(self, css_selector: str, timeout: float = 5) -> bool:
+        """Wait until an element matching css_selector is in the DOM.
+
+        Returns as soon as it appears (instead of sleeping a fixed interval);
+        False if it did not show up within timeout seconds.
+        """
+        if not self.driver:
+            return False
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    @staticmethod
+    def _make_soup(html: str, parse_only=None) -> BeautifulSoup:
+        """Parse HTML with the fastest available tree builder (lxml, else html.parser)"""
+        return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+    
+    def _find_product_cards(self, soup) -> List[Tag]:
+        """Product cards on a search page, using the first CARD_PROBES entry that matches.
+
+        Same result as trying each probe with soup.select() in turn, but the
+        page is walked once: every tag is tested against the probes that could
+        still win, and lower-priority probes are dropped as soon as a
+        higher-priority one has a hit.
+        """
+        probes = self._card_probes
+        matches = [[] for _ in probes]
+        limit = len(probes)
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            for index in range(limit):
+                if probes[index][1].match(tag):
+                    matches[index].append(tag)
+                    limit = index + 1
+                    break
+        for (selector, _), cards in zip(probes, matches):
+            if cards:
+                logger.info(f"Found {len(cards)} products using selector: {selector}")
+                return cards
+        return []
+    
+    @staticmethod
+    def _first_matches(element, selectors: Dict[str, "sv.SoupSieve"]) -> Dict[str, Optional[Tag]]:
+        """Resolve several compiled selectors in one walk over element's descendants.
+
+        Gives the same element per field as calling select_one for each, but the
+        subtree is traversed once and the walk stops when every field is found.
+        """
+        found = dict.fromkeys(selectors)
+        remaining = list(selectors.items())
+        for tag in element.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            for item in remaining[:]:
+                if item[1].match(tag):
+                    found[item[0]] = tag
+                    remaining.remove(item)
+            if not remaining:
+                break
+        return found
+    
+    @staticmethod
+    def _ranked_matches(element, ranked: Dict[Tuple[str, int], "sv.SoupSieve"]) -> Dict[str, Optional[Tag]]:
+        """Best element per field from one walk over element (see compile_ranked).
+
+        Each field gets the match of its earliest-listed selector that matched,
+        the same element an `or` chain of select_one calls would return. Once a
+        field's rank-k selector has matched, its ranks >= k are no longer tried,
+        and the walk stops when every field has its rank-0 match or nothing left
+        to try.
+        """
+        best: Dict[str, Optional[Tag]] = dict.fromkeys(field for field, _ in ranked)
+        # Lowest ranks first, so the first hit per field on a tag is its best one
+        remaining = sorted(((field, rank, selector) for (field, rank), selector in ranked.items()),
+                           key=lambda entry: entry[1])
+        for tag in element.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            matched: Dict[str, int] = {}
+            for field, rank, selector in remaining:
+                if field not in matched and selector.match(tag):
+                    matched[field] = rank
+            if matched:
+                for field in matched:
+                    best[field] = tag
+                remaining = [entry for entry in remaining
+                             if entry[0] not in matched or entry[1] < matched[entry[0]]]
+                if not remaining:
+                    break
+        return best
+    
+    @staticmethod
+    def _image_source(img_elem: Optional[Tag], attrs=('src', 'data-src')) -> Optional[str]:
+        """First non-empty attribute of img_elem among attrs, in order"""
+        if img_elem is None:
+            return None
+        for attr in attrs:
+            value = img_elem.get(attr)
+            if value:
+                return value
+        return None
+    
+    @staticmethod
+    def _is_blocked_url(url: Optional[str]) -> bool:
+        """Check if the browser was redirected to a block page"""
+        return bool(url) and any(token in url for token in _BLOCKED_TOKENS)
+    
+    def _absolute_url(self, url: str) -> str:
+        """Resolve a relative URL against the store's base URL"""
+        if url.startswith(_ABSOLUTE_URL_PREFIXES):
+            return url
+        # "/path" on an origin base is plain concatenation ("//host" and dot
+        # segments still go through urljoin)
+        if (self._base_is_origin and url[:1] == '/' and url[1:2] != '/'
+                and '/.' not in url):
+            return self.base_url + url
+        return _join(self.base_url, url)
+    
     def _delay(self):
         """Add delay between requests"""
         time.sleep(REQUEST_DELAY_SECONDS)
     
+    def _split_name(self, name: str) -> Tuple[Optional[str], Optional[str]]:
+        """Fallback (brand, size) read from a product name.
+
+        The brand guess is the first word when it starts with a capital and is
+        at least 3 characters long; scrapers that also read sizes override this.
+        """
+        first_word = _FIRST_WORD_RE.match(name)
+        if first_word and first_word.group(1)[0].isupper():
+            return first_word.group(1), None
+        return None, None
+    
+    def _generic_parse_card(self, element) -> Optional[Product]:
+        """Parse a search-result card using the scraper's CARD_SELECTORS table.
+
+        Recognised fields: name, price, brand, and optionally image, sale and
+        original_price. Prices go through the scraper's _extract_price.
+        """
+        try:
+            fields = self._ranked_matches(element, self._card_fields)
+            
+            link = fields['_link']
+            if not link:
+                if element.name == 'a' and element.get('href'):
+                    link = element
+                else:
+                    return None
+            
+            product_url = self._absolute_url(link.get('href', ''))
+            
+            # Extract product name
+            name_elem = fields['name'] or link
+            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
+            
+            if not name or name == 'Unknown Product' or len(name) < self.MIN_NAME_LENGTH:
+                return None
+            
+            # Extract price
+            price_elem = fields['price']
+            price = self._extract_price(price_elem.get_text() if price_elem else '')
+            
+            # Extract sale information (structural: sale/discount classes)
+            is_on_sale = False
+            original_price = None
+            sale_price = None
+            if fields.get('sale'):
+                is_on_sale = True
+                original_price_elem = fields.get('original_price')
+                if original_price_elem:
+                    original_price = self._extract_price(original_price_elem.get_text())
+                sale_price = price
+            
+            # Extract image
+            image_url = self._image_source(fields['image'], self.CARD_IMAGE_ATTRS)
+            if image_url:
+                image_url = self._absolute_url(image_url)
+            
+            # Extract brand, falling back to the name; size comes from the name
+            brand_elem = fields['brand']
+            brand = brand_elem.get_text(strip=True) if brand_elem else None
+            name_brand, size = self._split_name(name)
+            if not brand:
+                brand = name_brand
+            
+            return Product(
+                name=name,
+                price=price,
+                original_price=original_price,
+                sale_price=sale_price,
+                is_on_sale=is_on_sale,
+                image_url=image_url,
+                product_url=product_url,
+                brand=intern_text(brand),
+                size=intern_text(size),
+                source=self.source_name
+            )
+            
+        except Exception as e:
+            logger.error(f"Error parsing product element: {str(e)}")
+            return None
+    
+    def _search_via_api(self, query: str, max_results: int) -> Optional[List[Product]]:
+        """Search through the store's JSON API, skipping the browser entirely.
+
+        Returns None when no API is configured or it yields no products, so the
+        caller falls back to rendering the search page.
+        """
+        if not self.SEARCH_API_URL:
+            return None
+        try:
+            response = self.session.get(
+                self.SEARCH_API_URL.format(query=quote(query)),
+                headers={'Accept': 'application/json'},
+                timeout=15
+            )
+            if response.status_code != 200:
+                return None
+            records = self._find_api_records(response.json())
+        except Exception as e:
+            logger.warning(f"{self.source_name} search API failed, using browser: {str(e)}")
+            return None
+        
+        products = []
+        for record in records[:max_results]:
+            try:
+                product = self._parse_api_record(record)
+            except Exception as e:
+                # A malformed record is skipped; with none left the browser is used
+                logger.debug(f"Skipping unparseable {self.source_name} API record: {str(e)}")
+                continue
+            if product:
+                products.append(product)
+        if products:
+            logger.info(f"Found {len(products)} products via {self.source_name} search API")
+        return products or None
+    
+    @staticmethod
+    def _find_api_records(data) -> List[dict]:
+        """First list of product-like objects (dicts with a name key) in a JSON document"""
+        pending = [data]
+        while pending:
+            node = pending.pop(0)
+            if isinstance(node, dict):
+                pending.extend(node.values())
+            elif isinstance(node, list):
+                if node and isinstance(node[0], dict) and any(key in node[0] for key in _API_NAME_KEYS):
+                    return node
+                pending.extend(node)
+        return []
+    
+    def _parse_api_record(self, record: dict) -> Optional[Product]:
+        """Build a Product from one search API result"""
+        def first(keys):
+            return next((record[key] for key in keys if record.get(key)), None)
+        
+        name = first(_API_NAME_KEYS)
+        if not isinstance(name, str) or len(name.strip()) < self.MIN_NAME_LENGTH:
+            return None
+        
+        price = first(_API_PRICE_KEYS)
+        if isinstance(price, dict):
+            price = price.get('value') or price.get('amount')
+        if isinstance(price, str):
+            price = self._extract_price(price)
+        elif price is not None:
+            price = float(price)
+        
+        image_url = first(_API_IMAGE_KEYS)
+        product_url = first(_API_URL_KEYS)
+        brand = first(_API_BRAND_KEYS)
+        if isinstance(brand, dict):
+            brand = brand.get('name')
+        
+        return Product(
+            name=name.strip(),
+            price=price,
+            image_url=self._absolute_url(image_url) if isinstance(image_url, str) else None,
+            product_url=self._absolute_url(product_url) if isinstance(product_url, str) else None,
+            brand=intern_text(brand) if isinstance(brand, str) else None,
+            source=self.source_name
+        )
+    
+    async def search_many_async(self, queries: List[str], max_results: int = 50,
+                                concurrency: int = 4) -> Dict[str, List[Product]]:
+        """Run several searches at once in one headless Chromium driven by Playwright.
+
+        Pages share a single browser context and load concurrently on one event
+        loop, instead of one query at a time through this scraper's Selenium
+        driver. Like search_products, a query the store's JSON API answers
+        opens no page. Only for scrapers with SUPPORTS_ASYNC_SEARCH, and needs
+        the optional playwright package (ASYNC_SEARCH_AVAILABLE, plus
+        `playwright install chromium`). Returns {query: products}.
+        """
+        if not self.SUPPORTS_ASYNC_SEARCH:
+            raise NotImplementedError(f"{self.source_name} does not support search_many_async")
+        if async_playwright is None:
+            raise RuntimeError("search_many_async needs playwright: pip install playwright && playwright install chromium")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        blocked = self.BLOCKED_URL_PATTERNS
+        
+        async def search_one(context, query: str) -> List[Product]:
+            api_products = await asyncio.to_thread(self._search_via_api, query, max_results)
+            if api_products:
+                return api_products
+            async with semaphore:
+                page = await context.new_page()
+                try:
+                    await page.goto(self._search_url(query), wait_until='domcontentloaded',
+                                    timeout=BROWSER_TIMEOUT * 1000)
+                    if self.SEARCH_WAIT_SELECTOR:
+                        try:
+                            await page.wait_for_selector(self.SEARCH_WAIT_SELECTOR, state='attached', timeout=5000)
+                        except Exception:
+                            pass  # Parse whatever rendered, like _wait_for
+                    html = await page.content()
+                    return self._parse_search_page(html, max_results)
+                except Exception as e:
+                    logger.error(f"Error searching {self.source_name} for '{query}': {str(e)}")
+                    return []
+                finally:
+                    await page.close()
+        
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=HEADLESS_BROWSER)
+            try:
+                context = await browser.new_context(user_agent=USER_AGENT)
+                if blocked:
+                    await context.route(
+                        lambda url: any(fnmatch.fnmatchcase(url, pattern) for pattern in blocked),
+                        lambda route: route.abort()
+                    )
+                results = await asyncio.gather(*(search_one(context, query) for query in queries))
+            finally:
+                await browser.close()
+        return dict(zip(queries, results))
+    
     @abstractmethod
     def search_products(self, query: str, max_results: int = 50) -> List[Product]:
         """Search for products by query string"""
@@ -141,3 +745,99 @@ class BaseScraper(ABC):
         self._close_driver()
         self.session.close()
 
+
+def _create_driver() -> uc.Chrome:
+    """Start a new undetected Chrome browser with the scraper's standard options"""
+    options = uc.ChromeOptions()
+    
+    if HEADLESS_BROWSER:
+        options.add_argument('--headless=new')
+    else:
+        # Non-headless mode is better for avoiding detection
+        options.add_argument('--start-maximized')
+    
+    # Additional options for better stealth
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    
+    # Hand control back once the HTML is parsed (DOMContentLoaded) rather than
+    # after every image and third-party script; callers wait for the elements
+    # they need explicitly (_wait_for / WebDriverWait)
+    options.page_load_strategy = 'eager'
+    
+    # undetected-chromedriver patches the chromedriver binary on start-up,
+    # so concurrent launches (workers + warm-pool refiller) must not overlap
+    with _driver_create_lock:
+        driver = uc.Chrome(
+            options=options,
+            version_main=None,  # Auto-detect Chrome version
+            use_subprocess=True
+        )
+    driver.set_page_load_timeout(BROWSER_TIMEOUT)
+    
+    # Set window size
+    if not HEADLESS_BROWSER:
+        driver.set_window_size(1920, 1080)
+    
+    return driver
+
+
+# Warm pool of pre-started browsers used by _recreate_driver (opt-in, see
+# enable_driver_warm_pool). A background thread keeps it topped up.
+_warm_pool: "queue.Queue[uc.Chrome]" = queue.Queue(maxsize=2)
+_driver_create_lock = threading.Lock()
+_warm_pool_stop = threading.Event()
+_warm_pool_thread: Optional[threading.Thread] = None
+
+
+def _refill_warm_pool():
+    """Background loop: start a browser whenever the warm pool has room"""
+    while not _warm_pool_stop.is_set():
+        if _warm_pool.full():
+            _warm_pool_stop.wait(1)
+            continue
+        try:
+            driver = _create_driver()
+        except Exception as e:
+            logger.warning(f"Could not pre-warm Chrome driver: {e}")
+            _warm_pool_stop.wait(5)
+            continue
+        if _warm_pool_stop.is_set():
+            driver.quit()
+            break
+        try:
+            _warm_pool.put_nowait(driver)
+        except queue.Full:
+            driver.quit()
+
+
+def enable_driver_warm_pool():
+    """Start the background thread that keeps pre-warmed drivers ready"""
+    global _warm_pool_thread
+    if _warm_pool_thread is not None and _warm_pool_thread.is_alive():
+        return
+    _warm_pool_stop.clear()
+    _warm_pool_thread = threading.Thread(
+        target=_refill_warm_pool, name="driver-warm-pool", daemon=True
+    )
+    _warm_pool_thread.start()
+    logger.info(f"Driver warm pool enabled (up to {_warm_pool.maxsize} spare browsers)")
+
+
+def shutdown_driver_warm_pool():
+    """Stop the refiller thread and quit any unused pre-warmed drivers"""
+    global _warm_pool_thread
+    _warm_pool_stop.set()
+    if _warm_pool_thread is not None:
+        _warm_pool_thread.join(timeout=30)
+        _warm_pool_thread = None
+    while True:
+        try:
+            driver = _warm_pool.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            driver.quit()
+        except:
+            pass
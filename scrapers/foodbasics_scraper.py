@@ -5,19 +5,90 @@ Based on client requirements from spreadsheet
 import re
 import logging
 from typing import List, Optional
-from urllib.parse import urljoin, quote
+from urllib.parse import quote
 from bs4 import BeautifulSoup
 
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, cached_product_details, intern_text, card_strainer, compile_ranked
 from models.product import Product
 from config import FOOD_BASICS_BASE_URL
 
 logger = logging.getLogger(__name__)
 
+# Price formats in priority order, compiled once at import
+_PRICE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\$\s*(\d+\.\d{2})',
+    r'\$\s*(\d+)',
+    r'(\d+\.\d{2})\s*\$',
+))
+# Brand and size come out of one scan of the product name: 'first' is the first
+# word when it is at least 3 characters (brand fallback, checked without consuming
+# it so a leading "500g" can still be the size), 'qty'/'unit' the first size.
+_NAME_RE = re.compile(
+    r'(?:(?=\s*(?P<first>\S{3,})))?'
+    r'(?:.*?(?P<qty>\d+(?:\.\d+)?)\s*(?P<unit>(?i:L|ml|g|kg|oz|lb|un|pieces?)))?',
+    re.DOTALL
+)
+_SKU_URL_RE = re.compile(r'/p/(\d+)')
+_DIGITS_RE = re.compile(r'(\d+)')
+# Breadcrumb text is split on a control character that never appears in page text;
+# tokens without a word character are separators such as '>' or '/'
+_BREADCRUMB_SEP = '\x1f'
+_HAS_WORD_RE = re.compile(r'\w')
+
+# Selenium waits: any product card on search pages, the title on product pages
+_CARD_WAIT_SELECTOR = '[data-testid="product-card"], [class*="product-card"], a[href*="/aisles/"]'
+_DETAIL_WAIT_SELECTOR = 'h1'
+
+# Only product-card candidates (and their contents) are built from search pages
+_SEARCH_STRAINER = card_strainer('/aisles/')
+
+# Product-page fields and their fallback selectors in priority order. Every
+# alternative is compiled once and the page is walked a single time for all of
+# them; the first alternative that matched wins, as with an `or` chain.
+# ('sale' and 'out_of_stock' are only tested for presence, so unions are enough)
+_DETAIL_FIELDS = {
+    'name': ('h1[data-testid="product-name"]', 'h1[class*="name"]', 'h1[class*="title"]', 'h1'),
+    'price': ('[data-testid="price"]', '[class*="price"]', '[itemprop="price"]'),
+    'sale': ('[class*="sale"], [class*="on-sale"]',),
+    'original_price': ('[class*="original-price"]', '[class*="was-price"]'),
+    'image': ('img[class*="product-image"]', 'img[itemprop="image"]'),
+    'description': ('[class*="description"]', '[itemprop="description"]'),
+    'brand': ('[class*="brand"]', '[itemprop="brand"]'),
+    'size': ('[class*="size"]',),
+    'out_of_stock': ('[class*="out-of-stock"], [class*="unavailable"]',),
+}
+_DETAIL_SELECTORS = compile_ranked(_DETAIL_FIELDS)
+_BREADCRUMB_SELECTORS = compile_ranked({
+    'breadcrumb': ('[class*="breadcrumb"]', 'nav[aria-label*="breadcrumb"]'),
+})
+_SKU_SELECTORS = compile_ranked({
+    'sku': ('[class*="sku"]', '[data-testid="sku"]', '[itemprop="sku"]'),
+})
+
 
 class FoodBasicsScraper(BaseScraper):
     """Scraper for FoodBasics.ca - matches spreadsheet structure"""
     
+    # Product-card containers, tried in priority order
+    CARD_PROBES = (
+        '[data-testid="product-card"]',
+        '[class*="product-card"]',
+        '[class*="ProductCard"]',
+        'div[class*="product-item"]',
+        'article[class*="product"]',
+        'a[href*="/aisles/"]',
+    )
+    # Field fallback chains in priority order, compiled once by BaseScraper and
+    # resolved together in a single walk of each card (see _ranked_matches)
+    # ('sale' is only tested for presence, so a union is enough)
+    CARD_SELECTORS = {
+        'name': ('[data-testid="product-name"]', '[class*="name"]', '[class*="title"]', 'h2, h3, h4'),
+        'price': ('[data-testid="price"]', '[class*="price"]', '[class*="Price"]'),
+        'sale': '[class*="sale" i], [class*="discount" i]',
+        'original_price': ('[class*="original-price"]', '[class*="was-price"]', '[class*="regular-price"]'),
+        'brand': '[class*="brand"]',
+    }
+    
     def __init__(self):
         super().__init__(FOOD_BASICS_BASE_URL, 'foodbasics')
     
@@ -28,36 +99,18 @@ class FoodBasicsScraper(BaseScraper):
             search_url = f"{self.base_url}/search?q={quote(query)}"
             logger.info(f"Searching FoodBasics for: {query}")
             
-            soup = self._get_page(search_url, use_selenium=True)
-            if not soup:
+            # Waits for dynamic content (returns as soon as a card renders)
+            html = self._fetch_settled_html(search_url, _CARD_WAIT_SELECTOR)
+            if not html:
                 return products
             
-            import time
-            time.sleep(3)
-            
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # FoodBasics product selectors
-            product_selectors = [
-                '[data-testid="product-card"]',
-                '[class*="product-card"]',
-                '[class*="ProductCard"]',
-                'div[class*="product-item"]',
-                'article[class*="product"]',
-                'a[href*="/aisles/"]'
-            ]
+            soup = self._make_soup(html, parse_only=_SEARCH_STRAINER)
             
-            product_elements = []
-            for selector in product_selectors:
-                product_elements = soup.select(selector)
-                if product_elements:
-                    logger.info(f"Found {len(product_elements)} products using selector: {selector}")
-                    break
+            product_elements = self._find_product_cards(soup)
             
             for element in product_elements[:max_results]:
                 try:
-                    product = self._parse_product_element(element, soup)
+                    product = self._generic_parse_card(element)
                     if product:
                         products.append(product)
                 except Exception as e:
@@ -71,220 +124,126 @@ class FoodBasicsScraper(BaseScraper):
         
         return products
     
-    def _parse_product_element(self, element, soup: BeautifulSoup) -> Optional[Product]:
-        """Parse a product element from search results"""
-        try:
-            link = element.find('a', href=True)
-            if not link:
-                if element.name == 'a' and element.get('href'):
-                    link = element
-                else:
-                    return None
-            
-            product_url = link.get('href', '')
-            if not product_url.startswith('http'):
-                product_url = urljoin(self.base_url, product_url)
-            
-            # Extract product name
-            name_elem = (element.select_one('[data-testid="product-name"]') or
-                        element.select_one('[class*="name"]') or
-                        element.select_one('[class*="title"]') or
-                        element.select_one('h2, h3, h4') or
-                        link)
-            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            if not name or name == 'Unknown Product' or len(name) < 3:
-                return None
-            
-            # Extract price
-            price_elem = (element.select_one('[data-testid="price"]') or
-                         element.select_one('[class*="price"]') or
-                         element.select_one('[class*="Price"]'))
-            price = self._extract_price(price_elem.get_text() if price_elem else '')
-            
-            # Extract sale information
-            is_on_sale = False
-            original_price = None
-            sale_price = None
-            
-            # Check for sale indicators
-            sale_elem = (element.select_one('[class*="sale"]') or
-                        element.select_one('[class*="on-sale"]') or
-                        element.select_one('[class*="discount"]'))
-            
-            if sale_elem or 'sale' in element.get_text().lower():
-                is_on_sale = True
-                # Try to find original price
-                original_price_elem = (element.select_one('[class*="original-price"]') or
-                                     element.select_one('[class*="was-price"]') or
-                                     element.select_one('[class*="regular-price"]'))
-                if original_price_elem:
-                    original_price = self._extract_price(original_price_elem.get_text())
-                sale_price = price
-            
-            # Extract image
-            img_elem = (element.select_one('img[src]') or
-                       element.select_one('img[data-src]'))
-            image_url = None
-            if img_elem:
-                image_url = (img_elem.get('src') or img_elem.get('data-src'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            # Extract brand
-            brand_elem = element.select_one('[class*="brand"]')
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            if not brand and name:
-                words = name.split()
-                if words and words[0][0].isupper() and len(words[0]) > 2:
-                    brand = words[0]
-            
-            # Extract size from name or element
-            size = None
-            size_match = re.search(r'(\d+(?:\.\d+)?)\s*(L|ml|g|kg|oz|lb|un|pieces?)', name, re.IGNORECASE)
-            if size_match:
-                size = f"{size_match.group(1)}{size_match.group(2)}"
-            
-            return Product(
-                name=name,
-                price=price,
-                original_price=original_price,
-                sale_price=sale_price,
-                is_on_sale=is_on_sale,
-                image_url=image_url,
-                product_url=product_url,
-                brand=brand,
-                size=size,
-                source=self.source_name
-            )
-            
-        except Exception as e:
-            logger.error(f"Error parsing product element: {str(e)}")
-            return None
+    def _split_name(self, name: str):
+        """Fallback brand (capitalised first word) and size, from one scan of the name"""
+        name_match = _NAME_RE.match(name)
+        first_word = name_match.group('first')
+        brand = first_word if first_word and first_word[0].isupper() else None
+        size = None
+        if name_match.group('qty'):
+            size = f"{name_match.group('qty')}{name_match.group('unit')}"
+        return brand, size
     
     def _extract_price(self, price_text: str) -> Optional[float]:
         """Extract price from text"""
-        if not price_text:
+        # Every price format needs a '$'; skip the regex for text without one
+        if not price_text or '$' not in price_text:
             return None
         
-        price_patterns = [
-            r'\$\s*(\d+\.\d{2})',
-            r'\$\s*(\d+)',
-            r'(\d+\.\d{2})\s*\$',
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, price_text)
+        for pattern in _PRICE_PATTERNS:
+            match = pattern.search(price_text)
             if match:
-                try:
-                    price = float(match.group(1))
-                    if 0.01 <= price <= 10000:
-                        return price
-                except ValueError:
-                    continue
+                price = float(match.group(1))
+                if 0.01 <= price <= 10000:
+                    return price
         
         return None
     
+    @cached_product_details
     def get_product_details(self, product_url: str) -> Optional[Product]:
         """Get detailed product information from product page including categories and SKU"""
         try:
-            soup = self._get_page(product_url, use_selenium=True)
-            if not soup:
+            html = self._fetch_settled_html(product_url, _DETAIL_WAIT_SELECTOR)
+            if not html:
                 return None
-            
-            import time
-            time.sleep(2)
-            
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Extract product name
-            name_elem = (soup.select_one('h1[data-testid="product-name"]') or
-                        soup.select_one('h1[class*="name"]') or
-                        soup.select_one('h1[class*="title"]') or
-                        soup.select_one('h1'))
-            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            # Extract price
-            price_elem = (soup.select_one('[data-testid="price"]') or
-                         soup.select_one('[class*="price"]') or
-                         soup.select_one('[itemprop="price"]'))
-            price = self._extract_price(price_elem.get_text() if price_elem else '')
-            
-            # Extract sale information
-            is_on_sale = False
-            original_price = None
-            sale_price = None
-            
-            sale_indicator = (soup.select_one('[class*="sale"]') or
-                            soup.select_one('[class*="on-sale"]'))
-            if sale_indicator:
-                is_on_sale = True
-                original_price_elem = (soup.select_one('[class*="original-price"]') or
-                                     soup.select_one('[class*="was-price"]'))
-                if original_price_elem:
-                    original_price = self._extract_price(original_price_elem.get_text())
-                sale_price = price
-            
-            # Extract categories from breadcrumbs or URL
-            # FoodBasics URLs often contain category path: /aisles/category1/category2/category3/product
-            categories = self._extract_categories_from_url(product_url, soup)
-            
-            # Extract SKU
-            sku = self._extract_sku(soup, product_url)
-            
-            # Extract other details
-            img_elem = soup.select_one('img[class*="product-image"]') or soup.select_one('img[itemprop="image"]')
-            image_url = None
-            if img_elem:
-                image_url = (img_elem.get('src') or img_elem.get('data-src'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            desc_elem = soup.select_one('[class*="description"]') or soup.select_one('[itemprop="description"]')
-            description = desc_elem.get_text(strip=True) if desc_elem else None
-            
-            brand_elem = soup.select_one('[class*="brand"]') or soup.select_one('[itemprop="brand"]')
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            size_elem = soup.select_one('[class*="size"]')
-            size = size_elem.get_text(strip=True) if size_elem else None
-            
-            # Extract size from name if not found
-            if not size:
-                size_match = re.search(r'(\d+(?:\.\d+)?)\s*(L|ml|g|kg|oz|lb|un|pieces?)', name, re.IGNORECASE)
-                if size_match:
-                    size = f"{size_match.group(1)}{size_match.group(2)}"
-            
-            # Check stock
-            stock_elem = soup.select_one('[class*="out-of-stock"]') or soup.select_one('[class*="unavailable"]')
-            in_stock = stock_elem is None
-            
-            return Product(
-                name=name,
-                price=price,
-                original_price=original_price,
-                sale_price=sale_price,
-                is_on_sale=is_on_sale,
-                image_url=image_url,
-                product_url=product_url,
-                description=description,
-                brand=brand,
-                size=size,
-                master_category=categories.get('master_category'),
-                main_category=categories.get('main_category'),
-                category_2nd=categories.get('category_2nd'),
-                category_3rd=categories.get('category_3rd'),
-                sku=sku,
-                in_stock=in_stock,
-                source=self.source_name
-            )
+            return self._parse_product_page(html, product_url)
             
         except Exception as e:
             logger.error(f"Error getting product details from {product_url}: {str(e)}")
             return None
     
+    def _parse_product_page(self, html: str, product_url: str) -> Optional[Product]:
+        """Extract product fields from a product page's HTML"""
+        soup = self._make_soup(html)
+        
+        # All detail fields are resolved in one walk of the page
+        fields = self._ranked_matches(soup, _DETAIL_SELECTORS)
+        
+        # Extract product name
+        name_elem = fields['name']
+        name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
+        
+        # Extract price
+        price_elem = fields['price']
+        price = self._extract_price(price_elem.get_text() if price_elem else '')
+        
+        # Extract sale information
+        is_on_sale = False
+        original_price = None
+        sale_price = None
+        
+        sale_indicator = fields['sale']
+        if sale_indicator:
+            is_on_sale = True
+            original_price_elem = fields['original_price']
+            if original_price_elem:
+                original_price = self._extract_price(original_price_elem.get_text())
+            sale_price = price
+        
+        # Extract categories from breadcrumbs or URL
+        # FoodBasics URLs often contain category path: /aisles/category1/category2/category3/product
+        categories = self._extract_categories_from_url(product_url, soup)
+        
+        # Extract SKU
+        sku = self._extract_sku(soup, product_url)
+        
+        # Extract other details
+        img_elem = fields['image']
+        image_url = None
+        if img_elem:
+            image_url = (img_elem.get('src') or img_elem.get('data-src'))
+            if image_url:
+                image_url = self._absolute_url(image_url)
+        
+        desc_elem = fields['description']
+        description = desc_elem.get_text(strip=True) if desc_elem else None
+        
+        brand_elem = fields['brand']
+        brand = brand_elem.get_text(strip=True) if brand_elem else None
+        
+        size_elem = fields['size']
+        size = size_elem.get_text(strip=True) if size_elem else None
+        
+        # Extract size from name if not found
+        if not size:
+            name_match = _NAME_RE.match(name)
+            if name_match.group('qty'):
+                size = f"{name_match.group('qty')}{name_match.group('unit')}"
+        
+        # Check stock
+        stock_elem = fields['out_of_stock']
+        in_stock = stock_elem is None
+        
+        return Product(
+            name=name,
+            price=price,
+            original_price=original_price,
+            sale_price=sale_price,
+            is_on_sale=is_on_sale,
+            image_url=image_url,
+            product_url=product_url,
+            description=description,
+            brand=intern_text(brand),
+            size=intern_text(size),
+            master_category=categories.get('master_category'),
+            main_category=categories.get('main_category'),
+            category_2nd=categories.get('category_2nd'),
+            category_3rd=categories.get('category_3rd'),
+            sku=sku,
+            in_stock=in_stock,
+            source=self.source_name
+        )
+    
     def _extract_categories_from_url(self, url: str, soup: BeautifulSoup) -> dict:
         """Extract category hierarchy from URL or breadcrumbs"""
         categories = {
@@ -295,10 +254,15 @@ class FoodBasicsScraper(BaseScraper):
         }
         
         # Try to extract from breadcrumbs
-        breadcrumb_elem = soup.select_one('[class*="breadcrumb"]') or soup.select_one('nav[aria-label*="breadcrumb"]')
+        breadcrumb_elem = self._ranked_matches(soup, _BREADCRUMB_SELECTORS)['breadcrumb']
         if breadcrumb_elem:
-            breadcrumbs = breadcrumb_elem.select('a, span')
-            breadcrumb_texts = [b.get_text(strip=True) for b in breadcrumbs if b.get_text(strip=True)]
+            # One walk over the breadcrumb instead of a get_text per link; category
+            # names repeat across thousands of products, so share one string each
+            breadcrumb_texts = [
+                intern_text(text)
+                for text in breadcrumb_elem.get_text(_BREADCRUMB_SEP, strip=True).split(_BREADCRUMB_SEP)
+                if _HAS_WORD_RE.search(text)
+            ]
             # Map breadcrumbs to category levels (adjust based on actual structure)
             if len(breadcrumb_texts) >= 4:
                 categories['master_category'] = breadcrumb_texts[0] if len(breadcrumb_texts) > 0 else None
@@ -311,27 +275,25 @@ class FoodBasicsScraper(BaseScraper):
         if '/aisles/' in url:
             url_parts = url.split('/aisles/')[1].split('/')
             if len(url_parts) >= 3:
-                categories['category_2nd'] = url_parts[0].replace('-', ' ').title() if len(url_parts) > 0 else None
-                categories['category_3rd'] = url_parts[1].replace('-', ' ').title() if len(url_parts) > 1 else None
+                categories['category_2nd'] = intern_text(url_parts[0].replace('-', ' ').title()) if len(url_parts) > 0 else None
+                categories['category_3rd'] = intern_text(url_parts[1].replace('-', ' ').title()) if len(url_parts) > 1 else None
         
         return categories
     
     def _extract_sku(self, soup: BeautifulSoup, url: str) -> Optional[str]:
         """Extract SKU from product page or URL"""
         # Try to find SKU in page
-        sku_elem = (soup.select_one('[class*="sku"]') or
-                   soup.select_one('[data-testid="sku"]') or
-                   soup.select_one('[itemprop="sku"]'))
+        sku_elem = self._ranked_matches(soup, _SKU_SELECTORS)['sku']
         if sku_elem:
             sku_text = sku_elem.get_text(strip=True)
             # Extract numbers
-            sku_match = re.search(r'(\d+)', sku_text)
+            sku_match = _DIGITS_RE.search(sku_text)
             if sku_match:
                 return sku_match.group(1)
         
         # Try to extract from URL (FoodBasics URLs often end with /p/SKU)
         if '/p/' in url:
-            sku_match = re.search(r'/p/(\d+)', url)
+            sku_match = _SKU_URL_RE.search(url)
             if sku_match:
                 return sku_match.group(1)
         
@@ -4,19 +4,64 @@ Loblaws.ca scraper
 import re
 import logging
 from typing import List, Optional
-from urllib.parse import urljoin, quote
-from bs4 import BeautifulSoup
+from urllib.parse import quote
 
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, cached_product_details, intern_text, card_strainer, compile_ranked
 from models.product import Product
 from config import LOBLAWS_BASE_URL
 
 logger = logging.getLogger(__name__)
 
+# Price formats in priority order, compiled once at import
+_PRICE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\$\s*(\d+\.\d{2})',
+    r'\$\s*(\d+)',
+    r'(\d+\.\d{2})\s*\$',
+    r'(\d+\.\d{2})',
+))
+
+# Selenium waits: any product card on search pages, the title on product pages
+_CARD_WAIT_SELECTOR = '[data-testid="product-card"], [class*="product-card"], a[href*="/products/"]'
+_DETAIL_WAIT_SELECTOR = 'h1'
+
+# Only product-card candidates (and their contents) are built from search pages
+_SEARCH_STRAINER = card_strainer('/products/')
+
+# Product-page fields and their fallback selectors in priority order. Every
+# alternative is compiled once and the page is walked a single time for all of
+# them; the first alternative that matched wins, as with an `or` chain.
+_DETAIL_FIELDS = {
+    'name': ('h1[data-testid="product-name"]', 'h1[class*="name"]', 'h1[class*="title"]', 'h1'),
+    'price': ('[data-testid="price"]', '[class*="price"]', '[itemprop="price"]'),
+    'image': ('img[data-testid="product-image"]', 'img[class*="product-image"]', 'img[itemprop="image"]'),
+    'description': ('[data-testid="product-description"]', '[class*="description"]', '[itemprop="description"]'),
+    'brand': ('[data-testid="brand"]', '[class*="brand"]', '[itemprop="brand"]'),
+}
+_DETAIL_SELECTORS = compile_ranked(_DETAIL_FIELDS)
+
 
 class LoblawsScraper(BaseScraper):
     """Scraper for Loblaws.ca"""
     
+    # Product-card containers, tried in priority order
+    CARD_PROBES = (
+        '[data-testid="product-card"]',
+        '[class*="product-card"]',
+        '[class*="ProductCard"]',
+        'div[class*="product-item"]',
+        'article[class*="product"]',
+        'a[href*="/products/"]',
+    )
+    # Field fallback chains in priority order, compiled once by BaseScraper and
+    # resolved together in a single walk of each card (see _ranked_matches)
+    CARD_SELECTORS = {
+        'name': ('[data-testid="product-name"]', '[class*="name"]', '[class*="title"]', 'h2, h3, h4'),
+        'price': ('[data-testid="price"]', '[class*="price"]', '[class*="Price"]', 'span[class*="currency"]'),
+        'brand': ('[class*="brand"]', '[data-testid="brand"]'),
+    }
+    # Lazy-loaded card images keep their URL in data-* attributes
+    CARD_IMAGE_ATTRS = ('src', 'data-src', 'data-lazy-src')
+    
     def __init__(self):
         super().__init__(LOBLAWS_BASE_URL, 'loblaws')
     
@@ -27,37 +72,18 @@ class LoblawsScraper(BaseScraper):
             search_url = f"{self.base_url}/search?search-bar={quote(query)}"
             logger.info(f"Searching Loblaws for: {query}")
             
-            soup = self._get_page(search_url, use_selenium=True)
-            if not soup:
+            # Waits for dynamic content (returns as soon as a card renders)
+            html = self._fetch_settled_html(search_url, _CARD_WAIT_SELECTOR)
+            if not html:
                 return products
             
-            # Wait for dynamic content
-            import time
-            time.sleep(3)
-            
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self._make_soup(html, parse_only=_SEARCH_STRAINER)
             
-            # Loblaws product selectors
-            product_selectors = [
-                '[data-testid="product-card"]',
-                '[class*="product-card"]',
-                '[class*="ProductCard"]',
-                'div[class*="product-item"]',
-                'article[class*="product"]',
-                'a[href*="/products/"]'
-            ]
-            
-            product_elements = []
-            for selector in product_selectors:
-                product_elements = soup.select(selector)
-                if product_elements:
-                    logger.info(f"Found {len(product_elements)} products using selector: {selector}")
-                    break
+            product_elements = self._find_product_cards(soup)
             
             for element in product_elements[:max_results]:
                 try:
-                    product = self._parse_product_element(element, soup)
+                    product = self._generic_parse_card(element)
                     if product:
                         products.append(product)
                 except Exception as e:
@@ -71,154 +97,68 @@ class LoblawsScraper(BaseScraper):
         
         return products
     
-    def _parse_product_element(self, element, soup: BeautifulSoup) -> Optional[Product]:
-        """Parse a product element from search results"""
-        try:
-            link = element.find('a', href=True)
-            if not link:
-                if element.name == 'a' and element.get('href'):
-                    link = element
-                else:
-                    return None
-            
-            product_url = link.get('href', '')
-            if not product_url.startswith('http'):
-                product_url = urljoin(self.base_url, product_url)
-            
-            # Extract product name
-            name_elem = (element.select_one('[data-testid="product-name"]') or
-                        element.select_one('[class*="name"]') or
-                        element.select_one('[class*="title"]') or
-                        element.select_one('h2, h3, h4') or
-                        link)
-            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            if not name or name == 'Unknown Product' or len(name) < 3:
-                return None
-            
-            # Extract price
-            price_elem = (element.select_one('[data-testid="price"]') or
-                         element.select_one('[class*="price"]') or
-                         element.select_one('[class*="Price"]') or
-                         element.select_one('span[class*="currency"]'))
-            price = self._extract_price(price_elem.get_text() if price_elem else '')
-            
-            # Extract image
-            img_elem = (element.select_one('img[src]') or
-                       element.select_one('img[data-src]') or
-                       element.select_one('img[data-lazy-src]'))
-            image_url = None
-            if img_elem:
-                image_url = (img_elem.get('src') or 
-                           img_elem.get('data-src') or 
-                           img_elem.get('data-lazy-src'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            # Extract brand
-            brand_elem = (element.select_one('[class*="brand"]') or
-                         element.select_one('[data-testid="brand"]'))
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            if not brand and name:
-                words = name.split()
-                if words and words[0][0].isupper() and len(words[0]) > 2:
-                    brand = words[0]
-            
-            return Product(
-                name=name,
-                price=price,
-                image_url=image_url,
-                product_url=product_url,
-                brand=brand,
-                source=self.source_name
-            )
-            
-        except Exception as e:
-            logger.error(f"Error parsing product element: {str(e)}")
-            return None
-    
     def _extract_price(self, price_text: str) -> Optional[float]:
         """Extract price from text"""
-        if not price_text:
+        # Every price format needs a '$' or a decimal point; skip the regex otherwise
+        if not price_text or ('$' not in price_text and '.' not in price_text):
             return None
         
-        price_patterns = [
-            r'\$\s*(\d+\.\d{2})',
-            r'\$\s*(\d+)',
-            r'(\d+\.\d{2})\s*\$',
-            r'(\d+\.\d{2})',
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, price_text)
+        for pattern in _PRICE_PATTERNS:
+            match = pattern.search(price_text)
             if match:
-                try:
-                    price = float(match.group(1))
-                    if 0.5 <= price <= 1000:
-                        return price
-                except ValueError:
-                    continue
+                price = float(match.group(1))
+                if 0.5 <= price <= 1000:
+                    return price
         
         return None
     
+    @cached_product_details
     def get_product_details(self, product_url: str) -> Optional[Product]:
         """Get detailed product information from product page"""
         try:
-            soup = self._get_page(product_url, use_selenium=True)
-            if not soup:
+            html = self._fetch_settled_html(product_url, _DETAIL_WAIT_SELECTOR)
+            if not html:
                 return None
-            
-            import time
-            time.sleep(2)
-            
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Extract details (similar to Walmart scraper)
-            name_elem = (soup.select_one('h1[data-testid="product-name"]') or
-                        soup.select_one('h1[class*="name"]') or
-                        soup.select_one('h1[class*="title"]') or
-                        soup.select_one('h1'))
-            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            price_elem = (soup.select_one('[data-testid="price"]') or
-                         soup.select_one('[class*="price"]') or
-                         soup.select_one('[itemprop="price"]'))
-            price = self._extract_price(price_elem.get_text() if price_elem else '')
-            
-            img_elem = (soup.select_one('img[data-testid="product-image"]') or
-                       soup.select_one('img[class*="product-image"]') or
-                       soup.select_one('img[itemprop="image"]'))
-            image_url = None
-            if img_elem:
-                image_url = (img_elem.get('src') or img_elem.get('data-src'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            desc_elem = (soup.select_one('[data-testid="product-description"]') or
-                        soup.select_one('[class*="description"]') or
-                        soup.select_one('[itemprop="description"]'))
-            description = desc_elem.get_text(strip=True) if desc_elem else None
-            
-            brand_elem = (soup.select_one('[data-testid="brand"]') or
-                         soup.select_one('[class*="brand"]') or
-                         soup.select_one('[itemprop="brand"]'))
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            return Product(
-                name=name,
-                price=price,
-                image_url=image_url,
-                product_url=product_url,
-                description=description,
-                brand=brand,
-                source=self.source_name
-            )
+            return self._parse_product_page(html, product_url)
             
         except Exception as e:
             logger.error(f"Error getting product details from {product_url}: {str(e)}")
             return None
+    
+    def _parse_product_page(self, html: str, product_url: str) -> Optional[Product]:
+        """Extract product fields from a product page's HTML"""
+        soup = self._make_soup(html)
+        
+        # Extract details (similar to Walmart scraper), all fields in one walk
+        fields = self._ranked_matches(soup, _DETAIL_SELECTORS)
+        name_elem = fields['name']
+        name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
+        
+        price_elem = fields['price']
+        price = self._extract_price(price_elem.get_text() if price_elem else '')
+        
+        img_elem = fields['image']
+        image_url = None
+        if img_elem:
+            image_url = (img_elem.get('src') or img_elem.get('data-src'))
+            if image_url:
+                image_url = self._absolute_url(image_url)
+        
+        desc_elem = fields['description']
+        description = desc_elem.get_text(strip=True) if desc_elem else None
+        
+        brand_elem = fields['brand']
+        brand = brand_elem.get_text(strip=True) if brand_elem else None
+        
+        return Product(
+            name=name,
+            price=price,
+            image_url=image_url,
+            product_url=product_url,
+            description=description,
+            brand=intern_text(brand),
+            source=self.source_name
+        )
+        
 
-
-
+        
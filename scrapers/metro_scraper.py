@@ -1,22 +1,88 @@
 """
 Metro.ca scraper
 """
-import re
 import logging
 from typing import List, Optional
-from urllib.parse import urljoin, quote
-from bs4 import BeautifulSoup
+from urllib.parse import quote
 
-from scrapers.base_scraper import BaseScraper
+import soupsieve as sv
+
+from scrapers.base_scraper import BaseScraper, HEAVY_RESOURCE_PATTERNS, card_strainer
 from models.product import Product
-from config import METRO_BASE_URL
+from config import METRO_BASE_URL, METRO_SEARCH_API_URL
 
 logger = logging.getLogger(__name__)
 
+# Selenium waits: any product card on search pages, the title on product pages
+_CARD_WAIT_SELECTOR = '[data-testid="product-card"], [class*="product-card"], [class*="ProductCard"]'
+_DETAIL_WAIT_SELECTOR = 'h1'
+
+# Search pages are parsed for product cards only (see card_strainer)
+_SEARCH_STRAINER = card_strainer('/product')
+# Full-page fallback when no product card matched
+_FALLBACK_CARDS = sv.compile('div[class*="item"], a[href*="/product"]')
+
+# Product-page fields as selector unions, compiled once and resolved together
+# in a single walk of the page (see BaseScraper._first_matches)
+_DETAIL_FIELDS = {
+    'name': 'h1[data-testid="product-name"], h1[class*="name"], h1[class*="title"], h1',
+    'price': '[data-testid="price"], [class*="price"], [class*="Price"]',
+    'original_price': '[class*="original-price"], [class*="was-price"], [class*="regular-price"]',
+    'image': 'img[data-testid="product-image"], img[class*="product-image"], img[class*="main-image"]',
+    'description': '[data-testid="product-description"], [class*="description"]',
+    'brand': '[data-testid="brand"], [class*="brand"]',
+    'size': '[class*="size"], [class*="unit"], [class*="weight"]',
+    'out_of_stock': '[class*="out-of-stock"], [class*="unavailable"], [class*="not-available"]',
+}
+_DETAIL_SELECTORS = {field: sv.compile(selector) for field, selector in _DETAIL_FIELDS.items()}
+
+class _PriceChars(dict):
+    """str.translate table keeping only digits and '.'; built up lazily per character"""
+    
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        keep = char.isdecimal() or char == '.'
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+
+# Strips currency symbols, thousands separators and text before float() in one pass
+_PRICE_CHARS = _PriceChars()
+
 
 class MetroScraper(BaseScraper):
     """Scraper for Metro.ca"""
     
+    # Product-card containers, tried in priority order
+    CARD_PROBES = (
+        '[data-testid="product-card"]',
+        '[class*="product-card"]',
+        '[class*="ProductCard"]',
+        'div[class*="product-item"]',
+        'article[class*="product"]',
+    )
+    # Field fallback chains as selector unions, compiled once by BaseScraper
+    # and resolved together in a single walk of each card
+    CARD_SELECTORS = {
+        'name': '[data-testid="product-name"], [class*="name"], [class*="title"], h2, h3, h4',
+        'price': '[data-testid="price"], [class*="price"], [class*="Price"]',
+        'brand': '[class*="brand"], [data-testid="brand"]',
+        'image': 'img[src], img[data-src], img[data-lazy-src]',
+    }
+    # Lazy-loaded card images keep their URL in data-* attributes
+    CARD_IMAGE_ATTRS = ('src', 'data-src', 'data-lazy-src')
+    # Metro never dropped short card names
+    MIN_NAME_LENGTH = 1
+    
+    # Search pages are rendered in Chrome; skip downloading images, fonts and trackers
+    BLOCKED_URL_PATTERNS = HEAVY_RESOURCE_PATTERNS
+    # Store XHR search endpoint (configured via METRO_SEARCH_API_URL)
+    SEARCH_API_URL = METRO_SEARCH_API_URL
+    # Search pages can also be rendered concurrently (search_many_async)
+    SUPPORTS_ASYNC_SEARCH = True
+    # Rendered search pages are ready once a card is present
+    SEARCH_WAIT_SELECTOR = _CARD_WAIT_SELECTOR
+    
     def __init__(self):
         super().__init__(METRO_BASE_URL, 'metro')
     
@@ -24,52 +90,20 @@ class MetroScraper(BaseScraper):
         """Search for products on Metro.ca"""
         products = []
         try:
-            # Metro search URL - may need to adjust based on actual site structure
-            search_url = f"{self.base_url}/en/online/search?q={quote(query)}"
+            search_url = self._search_url(query)
             logger.info(f"Searching Metro for: {query}")
             
-            # Metro likely uses JavaScript, so use Selenium
-            soup = self._get_page(search_url, use_selenium=True)
-            if not soup:
-                return products
-            
-            # Wait a bit for dynamic content to load
-            import time
-            time.sleep(3)
-            
-            # Refresh soup after dynamic content loads
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Find product containers - Metro uses various selectors
-            product_selectors = [
-                '[data-testid="product-card"]',
-                '[class*="product-card"]',
-                '[class*="ProductCard"]',
-                'div[class*="product-item"]',
-                'article[class*="product"]'
-            ]
+            # The store's JSON API (when configured) answers without a browser
+            api_products = self._search_via_api(query, max_results)
+            if api_products:
+                return api_products
             
-            product_elements = []
-            for selector in product_selectors:
-                product_elements = soup.select(selector)
-                if product_elements:
-                    logger.info(f"Found {len(product_elements)} products using selector: {selector}")
-                    break
-            
-            if not product_elements:
-                # Fallback: look for any product-like containers
-                product_elements = soup.select('div[class*="item"], a[href*="/product"]')
-                logger.info(f"Fallback: Found {len(product_elements)} potential product elements")
+            # Metro likely uses JavaScript, so use Selenium; wait for the first card
+            html = self._fetch_settled_html(search_url, _CARD_WAIT_SELECTOR)
+            if not html:
+                return products
             
-            for element in product_elements[:max_results]:
-                try:
-                    product = self._parse_product_element(element, soup)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    logger.error(f"Error parsing product element: {str(e)}")
-                    continue
+            products = self._parse_search_page(html, max_results)
             
             self._delay()
             
@@ -78,121 +112,92 @@ class MetroScraper(BaseScraper):
         
         return products
     
-    def _parse_product_element(self, element, soup: BeautifulSoup) -> Optional[Product]:
-        """Parse a product element from search results"""
-        try:
-            # Extract product URL
-            link = element.find('a', href=True)
-            if not link:
-                if element.name == 'a' and element.get('href'):
-                    link = element
-                else:
-                    return None
-            
-            product_url = link.get('href', '')
-            if not product_url.startswith('http'):
-                product_url = urljoin(self.base_url, product_url)
-            
-            # Extract product name
-            name_elem = element.select_one('[data-testid="product-name"], [class*="name"], [class*="title"], h2, h3, h4')
-            if not name_elem:
-                name_elem = link
-            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            if not name or name == 'Unknown Product':
-                return None
-            
-            # Extract price
-            price_elem = element.select_one('[data-testid="price"], [class*="price"], [class*="Price"]')
-            price = self._extract_price(price_elem.get_text() if price_elem else '')
-            
-            # Extract image
-            img_elem = element.select_one('img[src], img[data-src], img[data-lazy-src]')
-            image_url = None
-            if img_elem:
-                image_url = img_elem.get('src') or img_elem.get('data-src') or img_elem.get('data-lazy-src')
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            # Extract brand if available
-            brand_elem = element.select_one('[class*="brand"], [data-testid="brand"]')
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            return Product(
-                name=name,
-                price=price,
-                image_url=image_url,
-                product_url=product_url,
-                brand=brand,
-                source=self.source_name
-            )
-            
-        except Exception as e:
-            logger.error(f"Error parsing product element: {str(e)}")
-            return None
+    def _search_url(self, query: str) -> str:
+        # Metro search URL - may need to adjust based on actual site structure
+        return f"{self.base_url}/en/online/search?q={quote(query)}"
     
-    def _extract_price(self, price_text: str) -> Optional[float]:
+    def _parse_search_page(self, html: str, max_results: int) -> List[Product]:
+        """Products from a rendered search page"""
+        products = []
+        soup = self._make_soup(html, parse_only=_SEARCH_STRAINER)
+        
+        product_elements = self._find_product_cards(soup)
+        
+        if not product_elements:
+            # Fallback: look for any product-like containers in the full page
+            soup = self._make_soup(html)
+            product_elements = _FALLBACK_CARDS.select(soup)
+            logger.info(f"Fallback: Found {len(product_elements)} potential product elements")
+        
+        for element in product_elements[:max_results]:
+            try:
+                product = self._generic_parse_card(element)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                logger.error(f"Error parsing product element: {str(e)}")
+                continue
+        
+        return products
+    
+    def _split_name(self, name: str):
+        """Metro cards keep the brand only in its own element; don't guess from the name"""
+        return None, None
+    
+    @staticmethod
+    def _extract_price(price_text: str) -> Optional[float]:
         """Extract price from text"""
         if not price_text:
             return None
         
-        # Remove currency symbols and extract number
-        price_text = re.sub(r'[^\d.,]', '', price_text)
-        price_text = price_text.replace(',', '')
-        
         try:
-            return float(price_text)
+            return float(price_text.translate(_PRICE_CHARS))
         except ValueError:
             return None
     
     def get_product_details(self, product_url: str) -> Optional[Product]:
         """Get detailed product information from product page"""
         try:
-            soup = self._get_page(product_url, use_selenium=True)
-            if not soup:
+            html = self._fetch_settled_html(product_url, _DETAIL_WAIT_SELECTOR)
+            if not html:
                 return None
-            
-            # Wait for dynamic content
-            import time
-            time.sleep(2)
-            
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self._make_soup(html)
+            fields = self._first_matches(soup, _DETAIL_SELECTORS)
             
             # Extract product name
-            name_elem = soup.select_one('h1[data-testid="product-name"], h1[class*="name"], h1[class*="title"], h1')
+            name_elem = fields['name']
             name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
             
             # Extract price
-            price_elem = soup.select_one('[data-testid="price"], [class*="price"], [class*="Price"]')
+            price_elem = fields['price']
             price = self._extract_price(price_elem.get_text() if price_elem else '')
             
             # Extract original price if on sale
-            original_price_elem = soup.select_one('[class*="original-price"], [class*="was-price"], [class*="regular-price"]')
+            original_price_elem = fields['original_price']
             original_price = self._extract_price(original_price_elem.get_text() if original_price_elem else '')
             
             # Extract image
-            img_elem = soup.select_one('img[data-testid="product-image"], img[class*="product-image"], img[class*="main-image"]')
+            img_elem = fields['image']
             image_url = None
             if img_elem:
                 image_url = img_elem.get('src') or img_elem.get('data-src')
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
+                if image_url:
+                    image_url = self._absolute_url(image_url)
             
             # Extract description
-            desc_elem = soup.select_one('[data-testid="product-description"], [class*="description"]')
+            desc_elem = fields['description']
             description = desc_elem.get_text(strip=True) if desc_elem else None
             
             # Extract brand
-            brand_elem = soup.select_one('[data-testid="brand"], [class*="brand"]')
+            brand_elem = fields['brand']
             brand = brand_elem.get_text(strip=True) if brand_elem else None
             
             # Extract size/unit
-            size_elem = soup.select_one('[class*="size"], [class*="unit"], [class*="weight"]')
+            size_elem = fields['size']
             size = size_elem.get_text(strip=True) if size_elem else None
             
             # Check stock status
-            stock_elem = soup.select_one('[class*="out-of-stock"], [class*="unavailable"], [class*="not-available"]')
+            stock_elem = fields['out_of_stock']
             in_stock = stock_elem is None
             
             return Product(
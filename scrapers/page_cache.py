@@ -0,0 +1,123 @@
+"""
+On-disk cache of rendered page sources, keyed by (store, url)
+
+Repeated searches for the same query (retries, rebuilds, UI refreshes) are
+served from disk instead of driving the browser again. Entries expire after
+PAGE_CACHE_TTL_SECONDS; the least recently used are pruned past
+PAGE_CACHE_MAX_ENTRIES per store.
+"""
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+from config import PAGE_CACHE_DIR, PAGE_CACHE_TTL_SECONDS, PAGE_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+# Stores are pruned every this many writes rather than on each one
+_PRUNE_EVERY = 100
+
+
+class PageCache:
+    """HTML files under <directory>/<store>/, one per URL.
+
+    A file's mtime is when the page was fetched (for the TTL) and its atime when
+    it was last served (for LRU pruning).
+    """
+    
+    def __init__(self, directory: str, ttl: float, max_entries: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.ttl > 0
+    
+    def _path(self, store: str, url: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, store, key + '.html')
+    
+    def get(self, store: str, url: str) -> Optional[str]:
+        """Cached page source for url, or None if missing or expired"""
+        if not self.enabled:
+            return None
+        path = self._path(store, url)
+        try:
+            mtime = os.stat(path).st_mtime
+            now = time.time()
+            if now - mtime > self.ttl:
+                return None
+            with open(path, encoding='utf-8') as f:
+                html = f.read()
+            # Record the use in atime, keeping mtime as the fetch time
+            os.utime(path, (now, mtime))
+            return html
+        except OSError:
+            return None
+    
+    def put(self, store: str, url: str, html: str):
+        """Store a page source, replacing any previous copy atomically"""
+        if not self.enabled:
+            return
+        path = self._path(store, url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not cache {url}: {str(e)}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % _PRUNE_EVERY == 0
+        if prune:
+            self._prune(store)
+    
+    def _prune(self, store: str):
+        """Drop the least recently used entries beyond max_entries"""
+        try:
+            with os.scandir(os.path.join(self.directory, store)) as it:
+                entries = [(entry.stat().st_atime, entry.path) for entry in it
+                           if entry.name.endswith('.html')]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def invalidate(self, store: str, url: Optional[str] = None):
+        """Evict one cached page, or every page of a store when url is None"""
+        if url is not None:
+            paths = [self._path(store, url)]
+        else:
+            try:
+                with os.scandir(os.path.join(self.directory, store)) as it:
+                    paths = [entry.path for entry in it]
+            except OSError:
+                return
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+page_cache = PageCache(PAGE_CACHE_DIR, PAGE_CACHE_TTL_SECONDS, PAGE_CACHE_MAX_ENTRIES)
+
+
+def invalidate(store: str, url: Optional[str] = None):
+    """Evict a store's cached page for url (all of its pages when url is None)"""
+    page_cache.invalidate(store.lower(), url)
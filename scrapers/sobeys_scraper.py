@@ -4,19 +4,69 @@ Sobeys.com scraper
 import re
 import logging
 from typing import List, Optional
-from urllib.parse import urljoin, quote
-from bs4 import BeautifulSoup
+from urllib.parse import quote
 
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, HEAVY_RESOURCE_PATTERNS, card_strainer, compile_ranked
 from models.product import Product
-from config import SOBEYS_BASE_URL
+from config import SOBEYS_BASE_URL, SOBEYS_SEARCH_API_URL
 
 logger = logging.getLogger(__name__)
 
+# Selenium waits: any product card on search pages, the title on product pages
+_CARD_WAIT_SELECTOR = '[data-testid="product-card"], [class*="product-card"], [class*="ProductCard"], a[href*="/products/"]'
+_DETAIL_WAIT_SELECTOR = 'h1'
+
+# Search pages are parsed for product cards only (see card_strainer)
+_SEARCH_STRAINER = card_strainer('/products/')
+
+# Price formats in priority order, compiled once at import
+_PRICE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\$\s*(\d+\.\d{2})',
+    r'\$\s*(\d+)',
+    r'(\d+\.\d{2})\s*\$',
+))
+
+# Product-page fields and their fallback selectors in priority order. Every
+# alternative is compiled once and the page is walked a single time for all of
+# them; the first alternative that matched wins, as with an `or` chain.
+_DETAIL_FIELDS = {
+    'name': ('h1', '[class*="product-name"]'),
+    'price': ('[class*="price"]', '[itemprop="price"]'),
+    'image': ('img[class*="product-image"]', 'img[itemprop="image"]'),
+    'description': ('[class*="description"]', '[itemprop="description"]'),
+    'brand': ('[class*="brand"]', '[itemprop="brand"]'),
+}
+_DETAIL_SELECTORS = compile_ranked(_DETAIL_FIELDS)
+
 
 class SobeysScraper(BaseScraper):
     """Scraper for Sobeys.com"""
     
+    # Product-card containers, tried in priority order
+    CARD_PROBES = (
+        '[data-testid="product-card"]',
+        '[class*="product-card"]',
+        '[class*="ProductCard"]',
+        'div[class*="product-item"]',
+        'a[href*="/products/"]',
+    )
+    # Field fallback chains in priority order, compiled once by BaseScraper and
+    # resolved together in a single walk of each card (see _ranked_matches)
+    CARD_SELECTORS = {
+        'name': ('[data-testid="product-name"]', '[class*="name"]', '[class*="title"]', 'h2, h3, h4'),
+        'price': ('[data-testid="price"]', '[class*="price"]', '[class*="Price"]'),
+        'brand': '[class*="brand"]',
+    }
+    
+    # Search pages are rendered in Chrome; skip downloading images, fonts and trackers
+    BLOCKED_URL_PATTERNS = HEAVY_RESOURCE_PATTERNS
+    # Store XHR search endpoint (configured via SOBEYS_SEARCH_API_URL)
+    SEARCH_API_URL = SOBEYS_SEARCH_API_URL
+    # Search pages can also be rendered concurrently (search_many_async)
+    SUPPORTS_ASYNC_SEARCH = True
+    # Rendered search pages are ready once a card is present
+    SEARCH_WAIT_SELECTOR = _CARD_WAIT_SELECTOR
+    
     def __init__(self):
         super().__init__(SOBEYS_BASE_URL, 'sobeys')
     
@@ -24,42 +74,20 @@ class SobeysScraper(BaseScraper):
         """Search for products on Sobeys.com"""
         products = []
         try:
-            search_url = f"{self.base_url}/en/search?q={quote(query)}"
+            search_url = self._search_url(query)
             logger.info(f"Searching Sobeys for: {query}")
             
-            soup = self._get_page(search_url, use_selenium=True)
-            if not soup:
-                return products
-            
-            import time
-            time.sleep(3)
-            
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            # The store's JSON API (when configured) answers without a browser
+            api_products = self._search_via_api(query, max_results)
+            if api_products:
+                return api_products
             
-            product_selectors = [
-                '[data-testid="product-card"]',
-                '[class*="product-card"]',
-                '[class*="ProductCard"]',
-                'div[class*="product-item"]',
-                'a[href*="/products/"]'
-            ]
-            
-            product_elements = []
-            for selector in product_selectors:
-                product_elements = soup.select(selector)
-                if product_elements:
-                    logger.info(f"Found {len(product_elements)} products using selector: {selector}")
-                    break
+            # Waits for dynamic content (returns as soon as a card renders)
+            html = self._fetch_settled_html(search_url, _CARD_WAIT_SELECTOR)
+            if not html:
+                return products
             
-            for element in product_elements[:max_results]:
-                try:
-                    product = self._parse_product_element(element, soup)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    logger.error(f"Error parsing product element: {str(e)}")
-                    continue
+            products = self._parse_search_page(html, max_results)
             
             self._delay()
             
@@ -68,117 +96,69 @@ class SobeysScraper(BaseScraper):
         
         return products
     
-    def _parse_product_element(self, element, soup: BeautifulSoup) -> Optional[Product]:
-        """Parse a product element from search results"""
-        try:
-            link = element.find('a', href=True)
-            if not link:
-                if element.name == 'a' and element.get('href'):
-                    link = element
-                else:
-                    return None
-            
-            product_url = link.get('href', '')
-            if not product_url.startswith('http'):
-                product_url = urljoin(self.base_url, product_url)
-            
-            name_elem = (element.select_one('[data-testid="product-name"]') or
-                        element.select_one('[class*="name"]') or
-                        element.select_one('[class*="title"]') or
-                        element.select_one('h2, h3, h4') or
-                        link)
-            name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            if not name or name == 'Unknown Product' or len(name) < 3:
-                return None
-            
-            price_elem = (element.select_one('[data-testid="price"]') or
-                         element.select_one('[class*="price"]') or
-                         element.select_one('[class*="Price"]'))
-            price = self._extract_price(price_elem.get_text() if price_elem else '')
-            
-            img_elem = (element.select_one('img[src]') or
-                       element.select_one('img[data-src]'))
-            image_url = None
-            if img_elem:
-                image_url = (img_elem.get('src') or img_elem.get('data-src'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            brand_elem = element.select_one('[class*="brand"]')
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            if not brand and name:
-                words = name.split()
-                if words and words[0][0].isupper() and len(words[0]) > 2:
-                    brand = words[0]
-            
-            return Product(
-                name=name,
-                price=price,
-                image_url=image_url,
-                product_url=product_url,
-                brand=brand,
-                source=self.source_name
-            )
-            
-        except Exception as e:
-            logger.error(f"Error parsing product element: {str(e)}")
-            return None
+    def _search_url(self, query: str) -> str:
+        return f"{self.base_url}/en/search?q={quote(query)}"
     
-    def _extract_price(self, price_text: str) -> Optional[float]:
+    def _parse_search_page(self, html: str, max_results: int) -> List[Product]:
+        """Products from a rendered search page"""
+        products = []
+        soup = self._make_soup(html, parse_only=_SEARCH_STRAINER)
+        
+        product_elements = self._find_product_cards(soup)
+        
+        for element in product_elements[:max_results]:
+            try:
+                product = self._generic_parse_card(element)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                logger.error(f"Error parsing product element: {str(e)}")
+                continue
+        
+        return products
+    
+    @staticmethod
+    def _extract_price(price_text: str) -> Optional[float]:
         """Extract price from text"""
         if not price_text:
             return None
         
-        price_patterns = [
-            r'\$\s*(\d+\.\d{2})',
-            r'\$\s*(\d+)',
-            r'(\d+\.\d{2})\s*\$',
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, price_text)
+        for pattern in _PRICE_PATTERNS:
+            match = pattern.search(price_text)
             if match:
-                try:
-                    price = float(match.group(1))
-                    if 0.5 <= price <= 1000:
-                        return price
-                except ValueError:
-                    continue
+                price = float(match.group(1))
+                if 0.5 <= price <= 1000:
+                    return price
         
         return None
     
     def get_product_details(self, product_url: str) -> Optional[Product]:
         """Get detailed product information from product page"""
         try:
-            soup = self._get_page(product_url, use_selenium=True)
-            if not soup:
+            html = self._fetch_settled_html(product_url, _DETAIL_WAIT_SELECTOR)
+            if not html:
                 return None
+            soup = self._make_soup(html)
             
-            import time
-            time.sleep(2)
+            fields = self._ranked_matches(soup, _DETAIL_SELECTORS)
             
-            if self.driver:
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            name_elem = soup.select_one('h1') or soup.select_one('[class*="product-name"]')
+            name_elem = fields['name']
             name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
             
-            price_elem = soup.select_one('[class*="price"]') or soup.select_one('[itemprop="price"]')
+            price_elem = fields['price']
             price = self._extract_price(price_elem.get_text() if price_elem else '')
             
-            img_elem = soup.select_one('img[class*="product-image"]') or soup.select_one('img[itemprop="image"]')
+            img_elem = fields['image']
             image_url = None
             if img_elem:
                 image_url = (img_elem.get('src') or img_elem.get('data-src'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
+                if image_url:
+                    image_url = self._absolute_url(image_url)
             
-            desc_elem = soup.select_one('[class*="description"]') or soup.select_one('[itemprop="description"]')
+            desc_elem = fields['description']
             description = desc_elem.get_text(strip=True) if desc_elem else None
             
-            brand_elem = soup.select_one('[class*="brand"]') or soup.select_one('[itemprop="brand"]')
+            brand_elem = fields['brand']
             brand = brand_elem.get_text(strip=True) if brand_elem else None
             
             return Product(
@@ -196,4 +176,3 @@ class SobeysScraper(BaseScraper):
             return None
 
 
-
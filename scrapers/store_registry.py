@@ -1,21 +1,31 @@
 """
 Store registry - manages all grocery store scrapers
 """
-from typing import Dict, Type, Optional
-from scrapers.base_scraper import BaseScraper
-from scrapers.walmart_scraper import WalmartScraper
-from scrapers.metro_scraper import MetroScraper
-from scrapers.loblaws_scraper import LoblawsScraper
-from scrapers.sobeys_scraper import SobeysScraper
-from scrapers.foodbasics_scraper import FoodBasicsScraper
-
-# Store registry mapping - all stores (flexible for adding more)
-STORE_SCRAPERS: Dict[str, Type[BaseScraper]] = {
-    'walmart': WalmartScraper,
-    'metro': MetroScraper,
-    'loblaws': LoblawsScraper,
-    'sobeys': SobeysScraper,
-    'foodbasics': FoodBasicsScraper,  # Added based on client spreadsheet
+import logging
+import importlib
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, List, Mapping, Tuple, Type, Optional, Union
+from models.product import Product
+
+if TYPE_CHECKING:
+    from scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+# Store registry mapping - all stores (flexible for adding more). Keys are
+# lower-case; change it through register_scraper(). Scrapers are given as
+# "module:Class" and imported on first use, so loading the registry doesn't
+# pull in every store's scraper (and Selenium) up front.
+ScraperSpec = Union[str, Type["BaseScraper"]]
+_STORE_SCRAPERS: Dict[str, ScraperSpec] = {
+    'walmart': 'scrapers.walmart_scraper:WalmartScraper',
+    'metro': 'scrapers.metro_scraper:MetroScraper',
+    'loblaws': 'scrapers.loblaws_scraper:LoblawsScraper',
+    'sobeys': 'scrapers.sobeys_scraper:SobeysScraper',
+    'foodbasics': 'scrapers.foodbasics_scraper:FoodBasicsScraper',  # Added based on client spreadsheet
     # Additional stores will be added step by step as client provides them
     # 'nofrills': NoFrillsScraper,
     # 'realcanadiansuperstore': RealCanadianSuperstoreScraper,
@@ -23,19 +33,88 @@ STORE_SCRAPERS: Dict[str, Type[BaseScraper]] = {
     # 'longos': LongosScraper,
     # 'fortinos': FortinosScraper,
 }
+# Read-only live view for callers
+STORE_SCRAPERS: Mapping[str, ScraperSpec] = MappingProxyType(_STORE_SCRAPERS)
+# Store names, rebuilt only when a scraper is registered
+_store_names: Tuple[str, ...] = tuple(_STORE_SCRAPERS)
+
+@lru_cache(maxsize=None)
+def _resolve(spec: ScraperSpec) -> Type["BaseScraper"]:
+    """Scraper class for a registry entry, importing its module on first use"""
+    if not isinstance(spec, str):
+        return spec
+    module_name, class_name = spec.rsplit(':', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+# One shared scraper per store, so its browser and HTTP session are reused
+_INSTANCES: Dict[str, "BaseScraper"] = {}
+_instances_lock = threading.Lock()
+
+def get_scraper(store_name: str) -> Optional["BaseScraper"]:
+    """Get the shared scraper instance for a store (created on first use)
+
+    A scraper drives a single browser, so use an instance from one thread at a time.
+    """
+    store_name = store_name.lower()
+    spec = STORE_SCRAPERS.get(store_name)
+    if not spec:
+        return None
+    with _instances_lock:
+        scraper = _INSTANCES.get(store_name)
+        if scraper is None:
+            scraper = _INSTANCES[store_name] = _resolve(spec)()
+    return scraper
+
+def close_all():
+    """Shut down every shared scraper's browser and session"""
+    with _instances_lock:
+        scrapers = list(_INSTANCES.values())
+        _INSTANCES.clear()
+    for scraper in scrapers:
+        try:
+            scraper.cleanup()
+        except Exception as e:
+            logger.warning(f"Error closing {scraper.source_name} scraper: {str(e)}")
 
-def get_scraper(store_name: str) -> Optional[BaseScraper]:
-    """Get a scraper instance for a store"""
-    scraper_class = STORE_SCRAPERS.get(store_name.lower())
-    if scraper_class:
-        return scraper_class()
-    return None
+def get_all_store_names() -> Tuple[str, ...]:
+    """Get all available store names"""
+    return _store_names
 
-def get_all_store_names() -> list:
-    """Get list of all available store names"""
-    return list(STORE_SCRAPERS.keys())
+def register_scraper(store_name: str, scraper_class: ScraperSpec):
+    """Register a new scraper (a class, or a lazily imported "module:Class" string)"""
+    global _store_names
+    store_name = store_name.lower()
+    _STORE_SCRAPERS[store_name] = scraper_class
+    _store_names = tuple(_STORE_SCRAPERS)
+    # Drop any instance of a previously registered class
+    with _instances_lock:
+        _INSTANCES.pop(store_name, None)
 
-def register_scraper(store_name: str, scraper_class: Type[BaseScraper]):
-    """Register a new scraper"""
-    STORE_SCRAPERS[store_name.lower()] = scraper_class
+def search_all(query: str, max_results: int = 50, max_workers: int = 5,
+               store_names: Optional[List[str]] = None) -> Dict[str, List[Product]]:
+    """Search several stores at once, one thread (and browser) per store.
 
+    Each store is a different site, so running them side by side doesn't
+    concentrate requests on any single one. Returns {store_name: products};
+    a store that fails gets an empty list. Browsers stay open for the next
+    call; shut them down with close_all().
+    """
+    names = [name.lower() for name in store_names] if store_names else get_all_store_names()
+    
+    def search_store(store_name: str) -> List[Product]:
+        return get_scraper(store_name).search_products(query, max_results)
+    
+    results: Dict[str, List[Product]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(search_store, name): name
+            for name in names if name in STORE_SCRAPERS
+        }
+        for future in as_completed(futures):
+            store_name = futures[future]
+            try:
+                results[store_name] = future.result()
+            except Exception as e:
+                logger.error(f"Error searching {store_name} for '{query}': {str(e)}")
+                results[store_name] = []
+    return results
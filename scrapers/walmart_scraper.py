@@ -4,21 +4,267 @@ Walmart.ca scraper
 import re
 import logging
 from typing import List, Optional
-from urllib.parse import urljoin, quote
-from bs4 import BeautifulSoup
+import requests
+from urllib.parse import quote, unquote, unquote_plus, urlsplit
+from bs4 import BeautifulSoup, SoupStrainer
+from selenium.webdriver.support.ui import WebDriverWait
+import soupsieve as sv
 
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, cached_product_details, compile_ranked
 from models.product import Product
 from config import WALMART_BASE_URL
 
 logger = logging.getLogger(__name__)
 
 
+# _extract_price formats in priority order: $4.47, $4, 4.47$ and a standalone
+# 4.47. Bare integers are never taken - single digits and small numbers usually
+# come from the product name.
+_PRICE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\$\s*(\d+\.\d{2})',  # $4.47
+    r'\$\s*(\d+)',         # $4
+    r'(\d+\.\d{2})\s*\$',  # 4.47$
+    r'(\d+\.\d{2})',       # 4.47 (standalone)
+))
+_NON_PRICE_CHARS_RE = re.compile(r'[^\d.,]')
+# Dollar amount anywhere in a tile's text (fallback when no price element matched)
+_INLINE_PRICE_RE = re.compile(r'\$\s*(\d+\.\d{2})')
+# Price patterns searched in a product page's full text, in priority order
+_PAGE_PRICE_PATTERNS = (
+    re.compile(r'\$\s*(\d+\.\d{2})', re.IGNORECASE),  # $4.47
+    re.compile(r'\$\s*(\d+)', re.IGNORECASE),         # $4
+    re.compile(r'(?:price|cost)[\s:]*\$?\s*(\d+\.?\d{0,2})', re.IGNORECASE),  # Price: $4.47
+    re.compile(r'(\d+\.\d{2})\s*\$', re.IGNORECASE),  # 4.47$
+)
+# Package size in a product name, e.g. "2L", "500 g"
+_SIZE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(L|ml|g|kg|oz|lb)', re.IGNORECASE)
+
+# The first non-empty rd= (redirect target) parameter of a query string
+_RD_PARAM_RE = re.compile(r'(?:^|&)rd=([^&]+)')
+
+# Leading words of a tile name that are never its brand
+_BRAND_STOPWORDS = frozenset({'the', 'a', 'an', 'this', 'that'})
+
+
+# Product-page fields with fallback selectors in priority order, resolved in one
+# walk of the page (see BaseScraper._ranked_matches)
+_DETAIL_FIELDS = compile_ranked({
+    'original_price': (
+        '[class*="original-price"]',
+        '[class*="was-price"]',
+        '[class*="strike"]',
+        'span[class*="regular-price"]',
+    ),
+    'image': (
+        'img[data-testid="product-image"]',
+        'img[data-automation="product-image"]',
+        'img[class*="product-image"]',
+        'img[class*="ProductImage"]',
+        'img[itemprop="image"]',
+    ),
+    'description': (
+        '[data-testid="product-description"]',
+        '[data-automation="product-description"]',
+        'div[class*="description"]',
+        'div[class*="about-this-item"]',
+        'ul[class*="description"]',
+        '[itemprop="description"]',
+    ),
+    'brand': (
+        '[data-testid="brand"]',
+        '[data-automation="brand"]',
+        'span[class*="brand"]',
+        'div[class*="brand"]',
+        '[itemprop="brand"]',
+    ),
+    'glance_table': ('table, div[class*="at-a-glance"]',),
+    'out_of_stock': (
+        '[class*="out-of-stock"]',
+        '[class*="unavailable"]',
+        'span[class*="sold-out"]',
+    ),
+})
+# Product-page title and price selectors, tried in order until one yields a
+# usable value (a title longer than 3 characters, a parseable price)
+_DETAIL_NAME_SELECTORS = tuple(sv.compile(selector) for selector in (
+    'h1[data-testid="product-title"]',
+    'h1[data-automation="product-title"]',
+    'h1[class*="product-title"]',
+    'h1[class*="ProductTitle"]',
+    'h1[class*="productName"]',
+    'h1[class*="product-name"]',
+    'h1[itemprop="name"]',
+    'h1',
+    '[data-testid="product-title"]',
+    '[data-automation="product-title"]',
+    'span[class*="product-title"]',
+    'div[class*="product-title"]',
+))
+_DETAIL_PRICE_SELECTORS = tuple(sv.compile(selector) for selector in (
+    'span[data-automation="product-price"]',
+    '[data-testid="price"]',
+    '[data-automation="price"]',
+    'span[class*="price"]',
+    'div[class*="price"]',
+    '[itemprop="price"]',
+    'span[class*="currency"]',
+    '[class*="Price"]',
+    '[class*="price-current"]',
+    '[class*="current-price"]',
+    'span[class*="price-value"]',
+    'div[class*="price-value"]',
+))
+_DESCRIPTION_ITEMS = sv.compile('li, p')
+_GLANCE_ROWS = sv.compile('tr, div[class*="row"]')
+
+
+# The product-page selectors above as plain lists, for _EXTRACT_DETAILS_JS
+_DETAIL_JS_SELECTORS = {
+    'name': [compiled.pattern for compiled in _DETAIL_NAME_SELECTORS],
+    'price': [compiled.pattern for compiled in _DETAIL_PRICE_SELECTORS],
+}
+for (_field, _), _compiled in _DETAIL_FIELDS.items():
+    _DETAIL_JS_SELECTORS.setdefault(_field, []).append(_compiled.pattern)
+
+# Browser-side twin of WalmartScraper._extract_details: same selectors, same
+# priorities, text read like BeautifulSoup's get_text(strip=True)
+_EXTRACT_DETAILS_JS = """
+const sel = arguments[0];
+const text = el => {
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    let out = '';
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) out += node.nodeValue.trim();
+    return out;
+};
+const first = list => {
+    for (const s of list) { const el = document.querySelector(s); if (el) return el; }
+    return null;
+};
+let name = null;
+for (const s of sel.name) {
+    const el = document.querySelector(s);
+    name = el ? text(el) : null;
+    if (name && name.length > 3 && name !== 'Unknown Product') break;
+}
+const prices = [];
+for (const s of sel.price) { const el = document.querySelector(s); if (el) prices.push(text(el)); }
+const img = first(sel.image);
+const image = img ? ['src', 'data-src', 'data-lazy-src', 'data-original']
+    .map(a => img.getAttribute(a)).find(v => v) || null : null;
+const descEl = first(sel.description);
+let description = null;
+if (descEl) {
+    const items = descEl.querySelectorAll('li, p');
+    description = items.length ? Array.from(items, text).join(' ') : text(descEl);
+}
+const brandEl = first(sel.brand);
+let brand = brandEl ? text(brandEl) : null;
+if (!brand) {
+    const table = first(sel.glance_table);
+    if (table) {
+        for (const row of table.querySelectorAll('tr, div[class*="row"]')) {
+            const t = row.textContent;
+            if (t.toLowerCase().includes('brand')) { brand = t.includes(':') ? t.split(':').pop().trim() : null; break; }
+        }
+    }
+}
+const original = first(sel.original_price);
+return {name, prices, image, description, brand,
+        original: original ? original.textContent : null,
+        outOfStock: !!first(sel.out_of_stock)};
+"""
+
+def _size_from_name(name: str) -> Optional[str]:
+    """Package size from a product name ("500 g" -> "500g"), None if it has none"""
+    size_match = _SIZE_RE.search(name)
+    if size_match:
+        return f"{size_match.group(1)}{size_match.group(2)}"
+    return None
+
+
+def _product_title_rendered(driver) -> bool:
+    """Wait condition: the product page's title element exists and has text"""
+    return bool(driver.execute_script(
+        "const title = document.querySelector('h1[data-testid=\"product-title\"], h1');"
+        "return !!(title && title.textContent.trim());"
+    ))
+
+
+def _is_product_tile(name: str, attrs: dict) -> bool:
+    """Product tiles and /ip/ product links - everything search_products looks for"""
+    if attrs.get('data-testid') == 'product-tile' or attrs.get('data-automation') == 'product-tile':
+        return True
+    css_class = attrs.get('class') or ''
+    if isinstance(css_class, list):
+        css_class = ' '.join(css_class)
+    if name == 'div' and ('product-tile' in css_class or 'ProductTile' in css_class):
+        return True
+    if name == 'article' and 'product' in css_class:
+        return True
+    return name == 'a' and '/ip/' in (attrs.get('href') or '')
+
+
+# Search pages are parsed for product tiles only; nav, footer, scripts etc. are
+# never turned into Python objects
+_TILE_STRAINER = SoupStrainer(_is_product_tile)
+
+# Product-tile containers on search pages, tried in priority order
+_TILE_SELECTORS = (
+    '[data-testid="product-tile"]',
+    '[data-automation="product-tile"]',
+    'div[class*="product-tile"]',
+    'div[class*="ProductTile"]',
+    'article[class*="product"]',
+)
+_TILE_PROBES = tuple((selector, sv.compile(selector)) for selector in _TILE_SELECTORS)
+_ANY_TILE = sv.compile(', '.join(_TILE_SELECTORS))
+# Fallback when no tile container matched: any product link
+_PRODUCT_LINKS = sv.compile('a[href*="/ip/"]')
+# A plain-HTTP search page with at least this many tiles is used as is (no browser)
+_FAST_PATH_MIN_TILES = 3
+# (connect, read) timeout of that probe; it is not retried, a miss just means
+# the browser is used
+_FAST_PATH_TIMEOUT = (3, 5)
+
+# Search-tile fields and their fallback selectors in priority order, all
+# resolved in a single walk of the tile (see BaseScraper._ranked_matches)
+_TILE_FIELDS = compile_ranked({
+    'link': ('a[href]',),
+    'name': (
+        '[data-testid="product-title"]',
+        '[data-automation="product-title"]',
+        'h2, h3, h4',
+        '[class*="title"]',
+        '[class*="name"]',
+        'span[class*="product-title"]',
+    ),
+    'price': (
+        '[data-testid="price"]',
+        '[data-automation="price"]',
+        'span[class*="price"]',
+        'div[class*="price"]',
+        '[class*="Price"]',
+        'span[class*="currency"]',
+        '[itemprop="price"]',
+    ),
+    'image': ('img[src]', 'img[data-src]', 'img[data-lazy-src]', 'img[data-original]'),
+    'brand': (
+        '[class*="brand"]',
+        '[data-testid="brand"]',
+        '[data-automation="brand"]',
+        'span[class*="Brand"]',
+    ),
+})
+
+
 class WalmartScraper(BaseScraper):
     """Scraper for Walmart.ca"""
     
     def __init__(self):
         super().__init__(WALMART_BASE_URL, 'walmart')
+        # Cleared once a plain-HTTP search fails, so the rest of the run goes
+        # straight to the browser
+        self._fast_fetch_ok = True
     
     def search_products(self, query: str, max_results: int = 50) -> List[Product]:
         """Search for products on Walmart.ca"""
@@ -28,45 +274,47 @@ class WalmartScraper(BaseScraper):
             search_url = f"{self.base_url}/search?q={quote(query)}"
             logger.info(f"Searching Walmart for: {query}")
             
-            soup = self._get_page(search_url, use_selenium=True)
+            # Server-rendered results need no browser; fall back to Selenium otherwise
+            soup = self._try_fast_fetch(search_url) if self._fast_fetch_ok else None
+            if not soup:
+                soup = self._get_page(search_url, use_selenium=True, parse_only=_TILE_STRAINER)
             if not soup:
                 # Only return None if actually blocked (URL contains blocked)
                 # Otherwise try to continue
                 if self.driver:
                     current_url = self.driver.current_url
-                    if "blocked" in current_url.lower():
+                    if self._is_blocked_url(current_url):
                         logger.warning(f"Actually blocked for {query} - skipping")
                         return None
                     else:
                         # Not actually blocked, try to get page source anyway
                         logger.warning(f"Page load issue for {query}, trying to extract from current page...")
                         try:
-                            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                            soup = self._make_soup(self.driver.page_source, parse_only=_TILE_STRAINER)
                         except:
                             return None
                 else:
                     return None
             
+            # The soup only holds tiles and /ip/ links: with no tag at all this is
+            # an empty result page, so skip the selector cascade
+            if soup.find() is None:
+                logger.info(f"No product tiles found for {query}")
+                self._delay()
+                return products
+            
             # Find product containers - Walmart uses various selectors
             # Try multiple selectors as Walmart's structure may vary
-            product_selectors = [
-                '[data-testid="product-tile"]',
-                '[data-automation="product-tile"]',
-                'div[class*="product-tile"]',
-                'div[class*="ProductTile"]',
-                'article[class*="product"]'
-            ]
-            
             product_elements = []
-            for selector in product_selectors:
-                product_elements = soup.select(selector)
+            for selector, compiled in _TILE_PROBES:
+                product_elements = compiled.select(soup)
                 if product_elements:
                     logger.info(f"Found {len(product_elements)} products using selector: {selector}")
                     break
             
             if not product_elements:
                 # Fallback: look for any links that might be products
-                product_elements = soup.select('a[href*="/ip/"]')
+                product_elements = _PRODUCT_LINKS.select(soup)
                 logger.info(f"Fallback: Found {len(product_elements)} potential product links")
             
             for element in product_elements[:max_results]:
@@ -93,11 +341,38 @@ class WalmartScraper(BaseScraper):
         
         return products
     
+    def _try_fast_fetch(self, url: str) -> Optional[BeautifulSoup]:
+        """Fetch a search page over plain HTTP (keep-alive session, no browser).
+
+        Returns the tile-strained soup only if it already holds enough product
+        tiles; None means the page needs JavaScript (or was a block page), and
+        turns the probe off for the rest of the run. A single short request,
+        outside the session's retrying adapter, so a stalled probe costs
+        seconds rather than the session's full retry budget.
+        """
+        try:
+            response = requests.get(url, headers=self.session.headers, timeout=_FAST_PATH_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Fast fetch failed for {url}: {str(e)}")
+            self._fast_fetch_ok = False
+            return None
+        if response.status_code != 200 or self._is_blocked_url(response.url):
+            self._fast_fetch_ok = False
+            return None
+        soup = self._make_soup(response.text, parse_only=_TILE_STRAINER)
+        if len(_ANY_TILE.select(soup, limit=_FAST_PATH_MIN_TILES)) < _FAST_PATH_MIN_TILES:
+            self._fast_fetch_ok = False
+            return None
+        logger.info(f"Search results served without a browser: {url}")
+        return soup
+    
     def _parse_product_element(self, element, soup: BeautifulSoup) -> Optional[Product]:
         """Parse a product element from search results"""
         try:
+            fields = self._ranked_matches(element, _TILE_FIELDS)
+            
             # Extract product URL
-            link = element.find('a', href=True)
+            link = fields['link']
             if not link:
                 # If element itself is a link
                 if element.name == 'a' and element.get('href'):
@@ -105,48 +380,33 @@ class WalmartScraper(BaseScraper):
                 else:
                     return None
             
-            product_url = link.get('href', '')
-            if not product_url.startswith('http'):
-                product_url = urljoin(self.base_url, product_url)
+            product_url = self._absolute_url(link.get('href', ''))
             
             # Clean up URL (remove tracking parameters)
             if '?' in product_url and 'rd=' in product_url:
                 # Extract the actual product URL from tracking link
-                import urllib.parse
-                parsed = urllib.parse.urlparse(product_url)
-                if 'rd=' in parsed.query:
-                    rd_param = urllib.parse.parse_qs(parsed.query).get('rd', [])
-                    if rd_param:
-                        product_url = urllib.parse.unquote(rd_param[0])
-            
-            # Extract product name - try multiple selectors
-            name_elem = (element.select_one('[data-testid="product-title"]') or 
-                        element.select_one('[data-automation="product-title"]') or
-                        element.select_one('h2, h3, h4') or
-                        element.select_one('[class*="title"]') or
-                        element.select_one('[class*="name"]') or
-                        element.select_one('span[class*="product-title"]') or
-                        link)
+                query = product_url.partition('#')[0].partition('?')[2]
+                rd_match = _RD_PARAM_RE.search(query)
+                if rd_match:
+                    # Decoded as parse_qs would, then once more as before
+                    product_url = unquote(unquote_plus(rd_match.group(1)))
+            
+            # Extract product name
+            name_elem = fields['name'] or link
             name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
             
             if not name or name == 'Unknown Product' or len(name) < 3:
                 return None
             
-            # Extract price - try multiple selectors
-            price_elem = (element.select_one('[data-testid="price"]') or
-                         element.select_one('[data-automation="price"]') or
-                         element.select_one('span[class*="price"]') or
-                         element.select_one('div[class*="price"]') or
-                         element.select_one('[class*="Price"]') or
-                         element.select_one('span[class*="currency"]') or
-                         element.select_one('[itemprop="price"]'))
+            # Extract price
+            price_elem = fields['price']
             price = self._extract_price(price_elem.get_text() if price_elem else '')
             
             # Also try to find price in text content (but be more careful)
             if not price:
                 element_text = element.get_text()
                 # Look for price patterns like $4.47 (with dollar sign and decimal)
-                price_match = re.search(r'\$\s*(\d+\.\d{2})', element_text)
+                price_match = _INLINE_PRICE_RE.search(element_text)
                 if price_match:
                     try:
                         price = float(price_match.group(1))
@@ -155,25 +415,19 @@ class WalmartScraper(BaseScraper):
                     except:
                         pass
             
-            # Extract image - try multiple selectors
-            img_elem = (element.select_one('img[src]') or
-                       element.select_one('img[data-src]') or
-                       element.select_one('img[data-lazy-src]') or
-                       element.select_one('img[data-original]'))
+            # Extract image
+            img_elem = fields['image']
             image_url = None
             if img_elem:
                 image_url = (img_elem.get('src') or 
                            img_elem.get('data-src') or 
                            img_elem.get('data-lazy-src') or
                            img_elem.get('data-original'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
+                if image_url:
+                    image_url = self._absolute_url(image_url)
             
-            # Extract brand - try multiple selectors
-            brand_elem = (element.select_one('[class*="brand"]') or
-                         element.select_one('[data-testid="brand"]') or
-                         element.select_one('[data-automation="brand"]') or
-                         element.select_one('span[class*="Brand"]'))
+            # Extract brand
+            brand_elem = fields['brand']
             brand = brand_elem.get_text(strip=True) if brand_elem else None
             
             # Try to extract brand from product name (first word if capitalized)
@@ -182,7 +436,7 @@ class WalmartScraper(BaseScraper):
                 if words and words[0][0].isupper() and len(words[0]) > 2:
                     # Common brands
                     potential_brand = words[0]
-                    if potential_brand.lower() not in ['the', 'a', 'an', 'this', 'that']:
+                    if potential_brand.lower() not in _BRAND_STOPWORDS:
                         brand = potential_brand
             
             return Product(
@@ -191,6 +445,7 @@ class WalmartScraper(BaseScraper):
                 image_url=image_url,
                 product_url=product_url,
                 brand=brand,
+                size=_size_from_name(name),
                 source=self.source_name
             )
             
@@ -200,31 +455,20 @@ class WalmartScraper(BaseScraper):
     
     def _extract_price(self, price_text: str) -> Optional[float]:
         """Extract price from text"""
-        if not price_text:
+        # Every price format needs a '$' or a decimal point; skip the regex otherwise
+        if not price_text or ('$' not in price_text and '.' not in price_text):
             return None
         
-        # Look for price patterns: $4.47, 4.47, $4, etc.
-        # But avoid matching single digits or very small numbers (likely from product names)
-        price_patterns = [
-            r'\$\s*(\d+\.\d{2})',  # $4.47
-            r'\$\s*(\d+)',         # $4
-            r'(\d+\.\d{2})\s*\$',  # 4.47$
-            r'(\d+\.\d{2})',       # 4.47 (standalone)
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, price_text)
+        # First format that matches, if within a reasonable range (between $0.50 and $1000)
+        for pattern in _PRICE_PATTERNS:
+            match = pattern.search(price_text)
             if match:
-                try:
-                    price = float(match.group(1))
-                    # Only accept reasonable prices (between $0.50 and $1000)
-                    if 0.5 <= price <= 1000:
-                        return price
-                except ValueError:
-                    continue
+                price = float(match.group(1))
+                if 0.5 <= price <= 1000:
+                    return price
         
         # Fallback: try to extract any number with decimal
-        price_text_clean = re.sub(r'[^\d.,]', '', price_text)
+        price_text_clean = _NON_PRICE_CHARS_RE.sub('', price_text)
         if '.' in price_text_clean:
             try:
                 price = float(price_text_clean.replace(',', ''))
@@ -235,213 +479,157 @@ class WalmartScraper(BaseScraper):
         
         return None
     
+    def _detail_cache_key(self, product_url: str) -> str:
+        """Walmart product pages are identified by their /ip/ path; the query is tracking"""
+        parts = urlsplit(product_url)
+        return f"{parts.netloc.lower()}{parts.path}"
+    
+    @cached_product_details
     def get_product_details(self, product_url: str) -> Optional[Product]:
         """Get detailed product information from product page"""
         try:
-            soup = self._get_page(product_url, use_selenium=True)
-            if not soup:
+            html = self._fetch_html(product_url, use_selenium=True, settle=False)
+            if html is None:
                 # Only skip if URL actually contains "blocked"
                 if self.driver:
                     current_url = self.driver.current_url
-                    if "blocked" in current_url.lower():
+                    if self._is_blocked_url(current_url):
                         logger.warning(f"Actually blocked when getting product details from {product_url}")
                         return None
-                    else:
-                        # Not actually blocked, try to extract from current page
-                        logger.warning(f"Page load issue, trying to extract from current page...")
-                        try:
-                            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                        except:
-                            return None
+                    # Not actually blocked, extract from the current page below
+                    logger.warning(f"Page load issue, trying to extract from current page...")
                 else:
                     return None
             
-            # Wait longer for dynamic content to load - Walmart uses React/JS
-            import time
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from selenium.webdriver.common.by import By
-            
+            # Wait for dynamic content - Walmart uses React/JS. One condition,
+            # polled often: returns as soon as the product title has rendered
             if self.driver:
-                # Wait for page to be interactive
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        lambda d: d.execute_script('return document.readyState') == 'complete'
-                    )
-                except:
-                    pass
-                
-                # Wait a bit more for React components
-                time.sleep(3)
-                
-                # Try to wait for product title to appear
                 try:
-                    WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                    )
-                except:
+                    WebDriverWait(self.driver, 12, poll_frequency=0.25).until(_product_title_rendered)
+                except Exception:
                     logger.warning("Product title not found, but continuing...")
                 
-                # Scroll to trigger lazy loading
-                self.driver.execute_script("window.scrollTo(0, 500);")
-                time.sleep(1)
-                self.driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(1)
+                # Fast path: fields straight from the DOM, no page-source export or parse
+                try:
+                    product = self._extract_details_from_dom(product_url)
+                except Exception as e:
+                    logger.debug(f"DOM extraction failed for {product_url}: {str(e)}")
+                    product = None
+                if product:
+                    return product
                 
-                # Refresh soup after dynamic content loads
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                # Take the page after dynamic content loads
+                html = self.driver.page_source
             
-            # Extract product name - try multiple selectors with more variations
-            name_elem = None
-            name_selectors = [
-                'h1[data-testid="product-title"]',
-                'h1[data-automation="product-title"]',
-                'h1[class*="product-title"]',
-                'h1[class*="ProductTitle"]',
-                'h1[class*="productName"]',
-                'h1[class*="product-name"]',
-                'h1[itemprop="name"]',
-                'h1',
-                '[data-testid="product-title"]',
-                '[data-automation="product-title"]',
-                'span[class*="product-title"]',
-                'div[class*="product-title"]'
-            ]
-            
-            for selector in name_selectors:
-                name_elem = soup.select_one(selector)
-                if name_elem:
-                    name_text = name_elem.get_text(strip=True)
-                    if name_text and len(name_text) > 3 and name_text != 'Unknown Product':
-                        break
+            # Parse once, from the settled page
+            return self._extract_details(self._make_soup(html), product_url)
             
+        except Exception as e:
+            logger.error(f"Error getting product details from {product_url}: {str(e)}", exc_info=True)
+            return None
+    
+    def _extract_details(self, soup, product_url: str) -> Optional[Product]:
+        """Extract product fields from a product page's soup"""
+        fields = self._ranked_matches(soup, _DETAIL_FIELDS)
+        
+        # Extract product name - try multiple selectors with more variations
+        name = 'Unknown Product'
+        for selector in _DETAIL_NAME_SELECTORS:
+            name_elem = selector.select_one(soup)
             name = name_elem.get_text(strip=True) if name_elem else 'Unknown Product'
-            
-            # Extract price - Walmart shows price in various formats - try many selectors
-            price = None
-            price_selectors = [
-                'span[data-automation="product-price"]',
-                '[data-testid="price"]',
-                '[data-automation="price"]',
-                'span[class*="price"]',
-                'div[class*="price"]',
-                '[itemprop="price"]',
-                'span[class*="currency"]',
-                '[class*="Price"]',
-                '[class*="price-current"]',
-                '[class*="current-price"]',
-                'span[class*="price-value"]',
-                'div[class*="price-value"]'
-            ]
-            
-            for selector in price_selectors:
-                price_elem = soup.select_one(selector)
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    price = self._extract_price(price_text)
-                    if price:
-                        break
-            
-            # Also search in page text for price pattern - more aggressive
-            if not price:
-                page_text = soup.get_text()
-                # Look for patterns like "$4.47", "$4", "Price: $4.47", etc.
-                price_patterns = [
-                    r'\$\s*(\d+\.\d{2})',  # $4.47
-                    r'\$\s*(\d+)',         # $4
-                    r'(?:price|cost)[\s:]*\$?\s*(\d+\.?\d{0,2})',  # Price: $4.47
-                    r'(\d+\.\d{2})\s*\$',  # 4.47$
-                ]
-                for pattern in price_patterns:
-                    price_match = re.search(pattern, page_text, re.IGNORECASE)
-                    if price_match:
-                        try:
-                            price = float(price_match.group(1))
-                            if 0.5 <= price <= 1000:  # Reasonable price range
-                                logger.info(f"Found price in page text: ${price}")
-                                break
-                        except:
-                            pass
-            
-            # Extract original price if on sale
-            original_price_elem = (soup.select_one('[class*="original-price"]') or
-                                  soup.select_one('[class*="was-price"]') or
-                                  soup.select_one('[class*="strike"]') or
-                                  soup.select_one('span[class*="regular-price"]'))
-            original_price = self._extract_price(original_price_elem.get_text() if original_price_elem else '')
-            
-            # Extract image - try multiple selectors
-            img_elem = (soup.select_one('img[data-testid="product-image"]') or
-                       soup.select_one('img[data-automation="product-image"]') or
-                       soup.select_one('img[class*="product-image"]') or
-                       soup.select_one('img[class*="ProductImage"]') or
-                       soup.select_one('img[itemprop="image"]'))
-            image_url = None
-            if img_elem:
-                image_url = (img_elem.get('src') or 
-                           img_elem.get('data-src') or 
-                           img_elem.get('data-lazy-src') or
-                           img_elem.get('data-original'))
-                if image_url and not image_url.startswith('http'):
-                    image_url = urljoin(self.base_url, image_url)
-            
-            # Extract description - "About this item" section
-            desc_elem = (soup.select_one('[data-testid="product-description"]') or
-                        soup.select_one('[data-automation="product-description"]') or
-                        soup.select_one('div[class*="description"]') or
-                        soup.select_one('div[class*="about-this-item"]') or
-                        soup.select_one('ul[class*="description"]') or
-                        soup.select_one('[itemprop="description"]'))
-            description = None
-            if desc_elem:
-                # Get all list items or paragraphs
-                desc_items = desc_elem.select('li, p')
-                if desc_items:
-                    description = ' '.join([item.get_text(strip=True) for item in desc_items])
-                else:
-                    description = desc_elem.get_text(strip=True)
-            
-            # Extract brand - try multiple selectors
-            brand_elem = (soup.select_one('[data-testid="brand"]') or
-                         soup.select_one('[data-automation="brand"]') or
-                         soup.select_one('span[class*="brand"]') or
-                         soup.select_one('div[class*="brand"]') or
-                         soup.select_one('[itemprop="brand"]'))
-            brand = brand_elem.get_text(strip=True) if brand_elem else None
-            
-            # Extract brand from "At a glance" table if available
-            if not brand:
-                glance_table = soup.select_one('table, div[class*="at-a-glance"]')
-                if glance_table:
-                    rows = glance_table.select('tr, div[class*="row"]')
-                    for row in rows:
-                        text = row.get_text()
-                        if 'brand' in text.lower():
-                            brand = text.split(':')[-1].strip() if ':' in text else None
+            if name and len(name) > 3 and name != 'Unknown Product':
+                break
+        
+        # Extract price - Walmart shows price in various formats - try many selectors
+        price = None
+        for selector in _DETAIL_PRICE_SELECTORS:
+            price_elem = selector.select_one(soup)
+            if price_elem:
+                price_text = price_elem.get_text(strip=True)
+                price = self._extract_price(price_text)
+                if price:
+                    break
+        
+        # Also search in page text for price pattern - more aggressive
+        if not price:
+            page_text = soup.get_text()
+            # Look for patterns like "$4.47", "$4", "Price: $4.47", etc.
+            for pattern in _PAGE_PRICE_PATTERNS:
+                price_match = pattern.search(page_text)
+                if price_match:
+                    try:
+                        price = float(price_match.group(1))
+                        if 0.5 <= price <= 1000:  # Reasonable price range
+                            logger.info(f"Found price in page text: ${price}")
                             break
-            
-            # Extract size/unit from product name or page
-            size = None
-            size_match = re.search(r'(\d+(?:\.\d+)?)\s*(L|ml|g|kg|oz|lb)', name, re.IGNORECASE)
-            if size_match:
-                size = f"{size_match.group(1)}{size_match.group(2)}"
-            
-            # Check stock status
-            stock_elem = (soup.select_one('[class*="out-of-stock"]') or
-                         soup.select_one('[class*="unavailable"]') or
-                         soup.select_one('span[class*="sold-out"]'))
-            in_stock = stock_elem is None
-            
-            # Log what we extracted for debugging
-            logger.info(f"Extracted from product page - Name: {name[:50]}, Price: ${price}, Brand: {brand}, Size: {size}")
-            
-            # Return product even if some fields are missing - as long as we have name
-            # This is important because the page might have the data but our selectors might not match
-            if name and name != 'Unknown Product' and len(name) > 3:
-                return Product(
-                    name=name,
-                    price=price,  # Can be None
-                    original_price=original_price,
+                    except:
+                        pass
+        
+        # Extract original price if on sale
+        original_price_elem = fields['original_price']
+        original_price = self._extract_price(original_price_elem.get_text() if original_price_elem else '')
+        
+        # Extract image
+        img_elem = fields['image']
+        image_url = None
+        if img_elem:
+            image_url = (img_elem.get('src') or 
+                       img_elem.get('data-src') or 
+                       img_elem.get('data-lazy-src') or
+                       img_elem.get('data-original'))
+            if image_url:
+                image_url = self._absolute_url(image_url)
+        
+        # Extract description - "About this item" section
+        desc_elem = fields['description']
+        description = None
+        if desc_elem:
+            # Get all list items or paragraphs
+            desc_items = _DESCRIPTION_ITEMS.select(desc_elem)
+            if desc_items:
+                description = ' '.join([item.get_text(strip=True) for item in desc_items])
+            else:
+                description = desc_elem.get_text(strip=True)
+        
+        # Extract brand
+        brand_elem = fields['brand']
+        brand = brand_elem.get_text(strip=True) if brand_elem else None
+        
+        # Extract brand from "At a glance" table if available
+        if not brand:
+            glance_table = fields['glance_table']
+            if glance_table:
+                rows = _GLANCE_ROWS.select(glance_table)
+                for row in rows:
+                    text = row.get_text()
+                    if 'brand' in text.lower():
+                        brand = text.split(':')[-1].strip() if ':' in text else None
+                        break
+        
+        # Check stock status
+        stock_elem = fields['out_of_stock']
+        in_stock = stock_elem is None
+        
+        return self._detail_product(product_url, name, price, original_price, image_url,
+                                    description, brand, in_stock)
+    
+    def _detail_product(self, product_url: str, name: str, price: Optional[float],
+                        original_price: Optional[float], image_url: Optional[str],
+                        description: Optional[str], brand: Optional[str],
+                        in_stock: bool) -> Optional[Product]:
+        """Build the Product for a product page (size comes from the name)"""
+        size = _size_from_name(name)
+        
+        # Log what we extracted for debugging
+        logger.info(f"Extracted from product page - Name: {name[:50]}, Price: ${price}, Brand: {brand}, Size: {size}")
+        
+        # Return product even if some fields are missing - as long as we have name
+        # This is important because the page might have the data but our selectors might not match
+        if name and name != 'Unknown Product' and len(name) > 3:
+            return Product(
+                name=name,
+                price=price,  # Can be None
+                original_price=original_price,
                 image_url=image_url,
                 product_url=product_url,
                 description=description,
@@ -450,13 +638,33 @@ class WalmartScraper(BaseScraper):
                 in_stock=in_stock,
                 source=self.source_name
             )
-            else:
-                logger.warning(f"Could not extract valid product name from {product_url}")
-                return None
-            
-        except Exception as e:
-            logger.error(f"Error getting product details from {product_url}: {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        else:
+            logger.warning(f"Could not extract valid product name from {product_url}")
             return None
+    
+    def _extract_details_from_dom(self, product_url: str) -> Optional[Product]:
+        """Read the product fields from the live DOM in a single script call.
 
+        Uses the same selectors and priorities as _extract_details, but the
+        browser's native querySelector does the work and only the field values
+        come back. Returns None (parse the page source instead) when the title
+        or a price isn't found.
+        """
+        data = self.driver.execute_script(_EXTRACT_DETAILS_JS, _DETAIL_JS_SELECTORS)
+        if not data:
+            return None
+        name = data.get('name')
+        if not name or name == 'Unknown Product' or len(name) <= 3:
+            return None
+        price = next(filter(None, map(self._extract_price, data.get('prices') or ())), None)
+        if price is None:
+            return None
+        
+        original_price = self._extract_price(data.get('original') or '')
+        image_url = data.get('image')
+        if image_url:
+            image_url = self._absolute_url(image_url)
+        
+        return self._detail_product(product_url, name, price, original_price, image_url,
+                                    data.get('description'), data.get('brand'),
+                                    not data.get('outOfStock'))
@@ -1,23 +1,26 @@
 """Show location of JSON files"""
 import os
-import glob
+from datetime import datetime
 
 print("=" * 70)
 print("JSON FILE LOCATION")
 print("=" * 70)
 
-# Find all Walmart JSON files
-json_files = glob.glob("walmart_scraped_products_*.json")
-json_files.sort(key=os.path.getmtime, reverse=True)  # Most recent first
+# Find all Walmart JSON files, stat-ing each once
+with os.scandir('.') as entries:
+    json_files = [
+        (entry.name, entry.stat()) for entry in entries
+        if entry.name.startswith('walmart_scraped_products_') and entry.name.endswith('.json')
+    ]
+json_files.sort(key=lambda item: item[1].st_mtime, reverse=True)  # Most recent first
 
 if json_files:
     print(f"\nFound {len(json_files)} JSON file(s):\n")
     
-    for i, file in enumerate(json_files, 1):
+    for i, (file, stat) in enumerate(json_files, 1):
         file_path = os.path.abspath(file)
-        file_size = os.path.getsize(file)
-        mod_time = os.path.getmtime(file)
-        from datetime import datetime
+        file_size = stat.st_size
+        mod_time = stat.st_mtime
         mod_time_str = datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d %H:%M:%S')
         
         print(f"{i}. {file}")
@@ -27,7 +30,7 @@ if json_files:
         print()
     
     print(f"\nMost Recent File:")
-    print(f"  {os.path.abspath(json_files[0])}")
+    print(f"  {os.path.abspath(json_files[0][0])}")
     print("\n" + "=" * 70)
 else:
     print("\nNo JSON files found!")
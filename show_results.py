@@ -1,16 +1,62 @@
 """Quick script to display scraper results"""
 import json
-import glob
 import os
+from itertools import islice
+
+try:
+    import ijson
+except ImportError:  # optional: without it the whole file is loaded
+    ijson = None
+
+# Products shown per store
+SHOWN = 10
+
+
+def load_results(path):
+    """Read just what is displayed: the query, total, and per-store count and first products.
+
+    With ijson the file is streamed, so only SHOWN products per store are ever
+    built, however large the result file is.
+    """
+    if ijson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for store in ('walmart', 'metro'):
+            data[store]['products'] = data[store]['products'][:SHOWN]
+        return data
+
+    def first(f, prefix, limit=1):
+        f.seek(0)
+        return list(islice(ijson.items(f, prefix, use_float=True), limit))
+
+    with open(path, 'rb') as f:
+        data = {'query': first(f, 'query')[0], 'total': first(f, 'total')[0]}
+        for store in ('walmart', 'metro'):
+            data[store] = {
+                'count': first(f, f'{store}.count')[0],
+                'products': first(f, f'{store}.products.item', SHOWN),
+            }
+    return data
+
+
+def latest_result_file():
+    """Most recently created product_search_*.json here, found in one directory scan"""
+    with os.scandir('.') as entries:
+        latest = max(
+            (entry for entry in entries
+             if entry.name.startswith('product_search_') and entry.name.endswith('.json')),
+            key=lambda entry: entry.stat().st_ctime,
+            default=None,
+        )
+    return latest.name if latest else None
+
 
 # Find the most recent result file
-result_files = glob.glob("product_search_*.json")
-if result_files:
-    latest = max(result_files, key=os.path.getctime)
+latest = latest_result_file()
+if latest:
     print(f"Showing results from: {latest}\n")
     
-    with open(latest, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_results(latest)
     
     print("=" * 70)
     print(f"Search Query: {data['query']}")
@@ -18,7 +64,7 @@ if result_files:
     
     print(f"\nWALMART ({data['walmart']['count']} products):")
     print("-" * 70)
-    for i, p in enumerate(data['walmart']['products'][:10], 1):
+    for i, p in enumerate(data['walmart']['products'][:SHOWN], 1):
         price_str = f"${p['price']:.2f}" if p.get('price') else "Price N/A"
         print(f"{i:2d}. {p['name'][:55]:55s} {price_str:>10s}")
         if p.get('product_url'):
@@ -26,7 +72,7 @@ if result_files:
     
     print(f"\nMETRO ({data['metro']['count']} products):")
     print("-" * 70)
-    for i, p in enumerate(data['metro']['products'][:10], 1):
+    for i, p in enumerate(data['metro']['products'][:SHOWN], 1):
         price_str = f"${p['price']:.2f}" if p.get('price') else "Price N/A"
         print(f"{i:2d}. {p['name'][:55]:55s} {price_str:>10s}")
         if p.get('product_url'):
@@ -3,6 +3,7 @@ Test script for local testing of the scraper
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from scrapers.walmart_scraper import WalmartScraper
 from scrapers.metro_scraper import MetroScraper
 
@@ -10,6 +11,15 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def print_products(products):
+    """Print the products found by one scraper"""
+    for i, product in enumerate(products, 1):
+        print(f"\n{i}. {product.name}")
+        print(f"   Price: ${product.price}")
+        print(f"   URL: {product.product_url}")
+        print(f"   Image: {product.image_url}")
+
+
 def test_walmart_scraper():
     """Test Walmart scraper with a simple query"""
     logger.info("Testing Walmart scraper...")
@@ -19,13 +29,6 @@ def test_walmart_scraper():
         # Test search
         products = scraper.search_products('milk', max_results=5)
         logger.info(f"Found {len(products)} products")
-        
-        for i, product in enumerate(products, 1):
-            print(f"\n{i}. {product.name}")
-            print(f"   Price: ${product.price}")
-            print(f"   URL: {product.product_url}")
-            print(f"   Image: {product.image_url}")
-        
         return products
     finally:
         scraper.cleanup()
@@ -40,13 +43,6 @@ def test_metro_scraper():
         # Test search
         products = scraper.search_products('milk', max_results=5)
         logger.info(f"Found {len(products)} products")
-        
-        for i, product in enumerate(products, 1):
-            print(f"\n{i}. {product.name}")
-            print(f"   Price: ${product.price}")
-            print(f"   URL: {product.product_url}")
-            print(f"   Image: {product.image_url}")
-        
         return products
     finally:
         scraper.cleanup()
@@ -57,12 +53,20 @@ if __name__ == '__main__':
     print("Testing Grocery Scrapers")
     print("=" * 60)
     
-    print("\n1. Testing Walmart.ca scraper...")
-    walmart_products = test_walmart_scraper()
+    # The two stores share nothing, so both scrapers run at the same time;
+    # their results are printed in order once both are done
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        walmart_future = executor.submit(test_walmart_scraper)
+        metro_future = executor.submit(test_metro_scraper)
+        walmart_products = walmart_future.result()
+        metro_products = metro_future.result()
+    
+    print("\n1. Walmart.ca scraper:")
+    print_products(walmart_products)
     
     print("\n" + "=" * 60)
-    print("\n2. Testing Metro.ca scraper...")
-    metro_products = test_metro_scraper()
+    print("\n2. Metro.ca scraper:")
+    print_products(metro_products)
     
     print("\n" + "=" * 60)
     print("\nTest Summary:")
@@ -3,14 +3,12 @@ Script to upload found products from walmart_scraped_products_20260109_074637.js
 Only uploads products where found: true
 """
 import json
-import gspread
-from google.oauth2.service_account import Credentials as ServiceAccountCredentials
-from google.oauth2.credentials import Credentials as OAuthCredentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import os
-import pickle
 import logging
+from utils.json_loader import load_products_cached
+from utils.gsheets_client import (
+    cached_credentials, remember_credentials, get_client, load_token, save_token,
+    with_quota_retry, PRODUCT_FIELDS, UPLOAD_CHUNK_ROWS, rows_for,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,11 +16,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# gspread and the google-auth modules are imported where they are used, so
+# that --help and argument errors don't pay for loading them
+
 # Google Sheets API scope
 # Only use Drive scope if creating new spreadsheets
 SCOPES_SHEETS_ONLY = ['https://www.googleapis.com/auth/spreadsheets']
 SCOPES_WITH_DRIVE = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
 
+# Only found products are uploaded, so the sheet has no Found column
+FIELDS = tuple(field for field in PRODUCT_FIELDS if field[0] != 'found')
+
 def detect_credential_type(credentials_file: str):
     """Detect if credentials file is service account or OAuth client"""
     try:
@@ -48,19 +52,21 @@ def detect_credential_type(credentials_file: str):
 def get_oauth_credentials(credentials_file: str, use_drive: bool = False):
     """Get OAuth credentials (with token storage)"""
     scopes = SCOPES_WITH_DRIVE if use_drive else SCOPES_SHEETS_ONLY
-    token_file = 'token.pickle'
-    creds = None
+    creds = cached_credentials(credentials_file, scopes)
+    if creds:
+        return creds
     
     # Load existing token if available
-    if os.path.exists(token_file):
-        try:
-            with open(token_file, 'rb') as token:
-                creds = pickle.load(token)
-        except Exception as e:
-            logger.warning(f"Could not load existing token: {str(e)}")
+    try:
+        creds = load_token()
+    except Exception as e:
+        logger.warning(f"Could not load existing token: {str(e)}")
     
     # If no valid credentials, get new ones
     if not creds or not creds.valid:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+        
         if creds and creds.expired and creds.refresh_token:
             logger.info("Refreshing expired token...")
             creds.refresh(Request())
@@ -70,14 +76,16 @@ def get_oauth_credentials(credentials_file: str, use_drive: bool = False):
             creds = flow.run_local_server(port=0)
         
         # Save token for next time
-        with open(token_file, 'wb') as token:
-            pickle.dump(creds, token)
+        save_token(creds)
         logger.info("Token saved for future use")
     
+    remember_credentials(credentials_file, scopes, creds)
     return creds
 
 def get_google_sheets_client(credentials_file: str, use_drive: bool = False):
     """Initialize Google Sheets client using either service account or OAuth credentials"""
+    from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+    
     try:
         cred_type = detect_credential_type(credentials_file)
         logger.info(f"Detected credential type: {cred_type}")
@@ -88,7 +96,7 @@ def get_google_sheets_client(credentials_file: str, use_drive: bool = False):
         else:
             creds = get_oauth_credentials(credentials_file, use_drive=use_drive)
         
-        client = gspread.authorize(creds)
+        client = get_client(creds)
         logger.info("Successfully authenticated with Google Sheets API")
         return client
     except Exception as e:
@@ -98,19 +106,21 @@ def get_google_sheets_client(credentials_file: str, use_drive: bool = False):
 def load_products_from_json(json_file: str):
     """Load products from JSON file and filter for found products only"""
     logger.info(f"Loading products from {json_file}")
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    products = load_products_cached(json_file)
+    total = len(products)
     
     # Filter only products where found: true
-    found_products = [p for p in data.get('products', []) if p.get('found') == True]
+    found_products = [p for p in products if p.get('found') is True]
     
-    logger.info(f"Total products in file: {len(data.get('products', []))}")
+    logger.info(f"Total products in file: {total}")
     logger.info(f"Found products (found=true): {len(found_products)}")
     
     return found_products
 
 def upload_to_google_sheets(products: list, spreadsheet_id: str = None, spreadsheet_name: str = 'Walmart Scraped Products', worksheet_name: str = 'Walmart Products', credentials_file: str = 'walmart-scraper-project-82db0cf1ae60.json'):
     """Upload products to Google Sheets"""
+    import gspread
+    
     try:
         # Initialize client (only need Drive API if creating new spreadsheet)
         need_drive = spreadsheet_id is None
@@ -152,35 +162,17 @@ def upload_to_google_sheets(products: list, spreadsheet_id: str = None, spreadsh
             'Scraped At'
         ]
         
-        # Clear existing data and add headers
-        worksheet.clear()
-        worksheet.append_row(headers)
-        logger.info("Headers added")
+        # Clear existing data
+        with_quota_retry(worksheet.clear)
         
         # Prepare data rows
-        rows = []
-        for product in products:
-            row = [
-                product.get('product_name', ''),
-                product.get('walmart_product_name', ''),
-                product.get('walmart_price', ''),
-                product.get('walmart_brand', ''),
-                product.get('walmart_size', ''),
-                'Yes' if product.get('walmart_in_stock') else 'No',
-                product.get('walmart_url', ''),
-                product.get('scraped_at', '')
-            ]
-            rows.append(row)
-        
-        # Upload data in batches (Google Sheets API limit is 10000 cells per request)
-        batch_size = 100
-        total_uploaded = 0
+        rows = rows_for(products, FIELDS)
         
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i:i+batch_size]
-            worksheet.append_rows(batch)
-            total_uploaded += len(batch)
-            logger.info(f"Uploaded {total_uploaded}/{len(rows)} products...")
+        # Upload headers and data together, UPLOAD_CHUNK_ROWS rows per request
+        table = [headers] + rows
+        for i in range(0, len(table), UPLOAD_CHUNK_ROWS):
+            with_quota_retry(worksheet.append_rows, table[i:i + UPLOAD_CHUNK_ROWS])
+            logger.info(f"Uploaded {min(i + UPLOAD_CHUNK_ROWS, len(table)) - 1}/{len(rows)} products...")
         
         logger.info(f"Successfully uploaded {len(rows)} products to Google Sheets!")
         logger.info(f"Spreadsheet URL: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
@@ -1,15 +1,16 @@
 """
 Upload Walmart scraped products to Google Sheets in a new sheet
 """
-import json
-import gspread
 from google.oauth2.credentials import Credentials as OAuthCredentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-import os
-import pickle
 import sys
 from datetime import datetime
+from utils.json_loader import load_products_cached
+from utils.gsheets_client import (
+    cached_credentials, remember_credentials, get_client, load_token, save_token,
+    with_quota_retry, UPLOAD_CHUNK_ROWS, rows_for,
+)
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -19,16 +20,15 @@ SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapi
 
 def get_credentials(credentials_file: str):
     """Get OAuth credentials"""
-    token_file = 'token.pickle'
-    creds = None
+    creds = cached_credentials(credentials_file, SCOPES)
+    if creds:
+        return creds
     
     # Load existing token if available
-    if os.path.exists(token_file):
-        try:
-            with open(token_file, 'rb') as token:
-                creds = pickle.load(token)
-        except Exception as e:
-            print(f"Could not load existing token: {str(e)}")
+    try:
+        creds = load_token()
+    except Exception as e:
+        print(f"Could not load existing token: {str(e)}")
     
     # If no valid credentials, get new ones
     if not creds or not creds.valid:
@@ -42,19 +42,17 @@ def get_credentials(credentials_file: str):
             creds = flow.run_local_server(port=0)
         
         # Save token for next time
-        with open(token_file, 'wb') as token:
-            pickle.dump(creds, token)
+        save_token(creds)
         print("Token saved for future use")
     
+    remember_credentials(credentials_file, SCOPES, creds)
     return creds
 
 def load_products(json_file: str):
     """Load all products from JSON file"""
     print(f"Loading products from {json_file}...")
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    products = load_products_cached(json_file)
     
-    products = data.get('products', [])
     print(f"Loaded {len(products)} products")
     return products
 
@@ -69,7 +67,7 @@ def upload_to_sheets(products: list, spreadsheet_id: str, sheet_name: str = None
     
     print(f"\nAuthenticating with Google Sheets...")
     creds = get_credentials(credentials_file)
-    client = gspread.authorize(creds)
+    client = get_client(creds)
     
     print(f"\nOpening spreadsheet: {spreadsheet_id}")
     try:
@@ -103,34 +101,14 @@ def upload_to_sheets(products: list, spreadsheet_id: str, sheet_name: str = None
     
     print(f"\nUploading {len(products)} products...")
     
-    # Add headers
-    worksheet.append_row(headers)
-    
-    # Prepare and upload data in batches
-    batch_size = 100
-    rows = []
-    
-    for product in products:
-        row = [
-            product.get('product_name', ''),
-            'Yes' if product.get('found') else 'No',
-            product.get('walmart_product_name', ''),
-            product.get('walmart_price', ''),
-            product.get('walmart_brand', ''),
-            product.get('walmart_size', ''),
-            'Yes' if product.get('walmart_in_stock') else 'No',
-            product.get('walmart_url', ''),
-            product.get('scraped_at', '')
-        ]
-        rows.append(row)
-    
-    # Upload in batches
-    uploaded = 0
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i+batch_size]
-        worksheet.append_rows(batch)
-        uploaded += len(batch)
-        print(f"  Uploaded {uploaded}/{len(rows)} products...")
+    # Prepare data rows
+    rows = rows_for(products)
+    
+    # Upload headers and data together, UPLOAD_CHUNK_ROWS rows per request
+    table = [headers] + rows
+    for i in range(0, len(table), UPLOAD_CHUNK_ROWS):
+        with_quota_retry(worksheet.append_rows, table[i:i + UPLOAD_CHUNK_ROWS])
+        print(f"  Uploaded {min(i + UPLOAD_CHUNK_ROWS, len(table)) - 1}/{len(rows)} products...")
     
     print(f"\n✅ Successfully uploaded {len(products)} products to Google Sheets!")
     print(f"\nSpreadsheet URL: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
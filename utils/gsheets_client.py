@@ -0,0 +1,124 @@
+"""
+Google Sheets helpers shared by the upload scripts
+OAuth tokens are stored as JSON and kept in memory for the rest of the process;
+quota-limited API calls are retried with exponential backoff
+"""
+import os
+import time
+import pickle
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+TOKEN_FILE = 'token.json'
+# Token file written by earlier versions; read once and converted to TOKEN_FILE
+LEGACY_TOKEN_FILE = 'token.pickle'
+
+# Sheets calls rejected with 429 (write quota exceeded) are retried this many
+# times in all, waiting 1, 2, 4, ... seconds (at most QUOTA_RETRY_MAX_DELAY)
+QUOTA_RETRY_ATTEMPTS = 7
+QUOTA_RETRY_MAX_DELAY = 64
+
+# Rows sent per append request (one request for any normal upload)
+UPLOAD_CHUNK_ROWS = 10000
+
+# Product keys in sheet column order; True marks Yes/No flag columns
+PRODUCT_FIELDS: Tuple[Tuple[str, bool], ...] = (
+    ('product_name', False),
+    ('found', True),
+    ('walmart_product_name', False),
+    ('walmart_price', False),
+    ('walmart_brand', False),
+    ('walmart_size', False),
+    ('walmart_in_stock', True),
+    ('walmart_url', False),
+    ('scraped_at', False),
+)
+
+# Sheet text for a flag column, indexed by the flag's truth value; a flag
+# stored as None (unknown, e.g. stock status not checked) is left blank
+_YN = ('No', 'Yes')
+
+# (credentials file, scopes) -> credentials already obtained in this process
+_credentials_cache = {}
+# credentials -> gspread client authorized with them in this process
+_client_cache = {}
+
+
+def cached_credentials(credentials_file: str, scopes: Sequence[str]) -> Optional['Credentials']:
+    """Credentials obtained earlier in this process, if they are still valid"""
+    creds = _credentials_cache.get((credentials_file, tuple(scopes)))
+    if creds is not None and creds.valid:
+        return creds
+    return None
+
+
+def remember_credentials(credentials_file: str, scopes: Sequence[str], creds: 'Credentials'):
+    """Keep credentials for later cached_credentials calls in this process"""
+    _credentials_cache[(credentials_file, tuple(scopes))] = creds
+
+
+def get_client(creds: 'Credentials'):
+    """gspread client for these credentials, authorized once per process
+
+    Reusing the client also reuses its HTTP session, and with it the open
+    connection to the Google APIs.
+    """
+    client = _client_cache.get(creds)
+    if client is None:
+        import gspread
+        
+        client = _client_cache[creds] = gspread.authorize(creds)
+    return client
+
+
+def load_token() -> Optional['Credentials']:
+    """Load the saved OAuth token (None if there is none)"""
+    from google.oauth2.credentials import Credentials
+    
+    if os.path.exists(TOKEN_FILE):
+        return Credentials.from_authorized_user_file(TOKEN_FILE)
+    if os.path.exists(LEGACY_TOKEN_FILE):
+        with open(LEGACY_TOKEN_FILE, 'rb') as token:
+            creds = pickle.load(token)
+        save_token(creds)
+        logger.info(f"Converted {LEGACY_TOKEN_FILE} to {TOKEN_FILE}")
+        return creds
+    return None
+
+
+def save_token(creds: 'Credentials'):
+    """Save the OAuth token for the next run"""
+    with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
+        token.write(creds.to_json())
+
+
+def with_quota_retry(call, *args, **kwargs):
+    """Run a Sheets API call, backing off and retrying while it is rejected with 429"""
+    import gspread
+    
+    for attempt in range(QUOTA_RETRY_ATTEMPTS):
+        try:
+            return call(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code != 429 or attempt == QUOTA_RETRY_ATTEMPTS - 1:
+                raise
+            delay = min(2 ** attempt, QUOTA_RETRY_MAX_DELAY)
+            logger.warning(f"Google Sheets quota exceeded, retrying in {delay}s...")
+            time.sleep(delay)
+
+
+def rows_for(products: Iterable[Dict], fields: Sequence[Tuple[str, bool]] = PRODUCT_FIELDS) -> List[list]:
+    """Sheet rows for products, one cell per (key, is_flag) field"""
+    return [[_cell(product.get(key, ''), yes_no) for key, yes_no in fields] for product in products]
+
+
+def _cell(value, yes_no: bool):
+    """Sheet cell for one product value"""
+    if not yes_no:
+        return value
+    return '' if value is None else _YN[bool(value)]
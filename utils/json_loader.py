@@ -0,0 +1,88 @@
+"""
+JSON file loading shared by the upload and verification scripts
+Uses orjson when it is installed, the standard json module otherwise;
+reads Zstandard-compressed (.json.zst) files when zstandard is installed
+"""
+import os
+import json
+import functools
+from typing import List
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional: without it the whole file is parsed
+    ijson = None
+
+try:
+    import zstandard
+except ImportError:  # optional: without it backups are plain .json copies
+    zstandard = None
+
+ZSTD_SUFFIX = '.zst'
+# Names a JSON file (plain or compressed) can end with
+JSON_SUFFIXES = ('.json', '.json' + ZSTD_SUFFIX)
+COMPRESSION_AVAILABLE = zstandard is not None
+ZSTD_LEVEL = 3
+
+# Files at least this size are streamed with ijson (when installed); smaller
+# ones are faster to parse whole with orjson/json
+STREAM_MIN_BYTES = 10 * 1024 * 1024
+
+
+def should_stream(path: str) -> bool:
+    """Whether to read path with ijson rather than parse it whole"""
+    return ijson is not None and os.path.getsize(path) >= STREAM_MIN_BYTES
+
+
+def open_json_stream(path: str):
+    """Binary stream of a JSON file's text, decompressing .zst files"""
+    f = open(path, 'rb')
+    if not path.endswith(ZSTD_SUFFIX):
+        return f
+    if zstandard is None:
+        f.close()
+        raise ImportError(f"zstandard is needed to read {path}")
+    return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+
+
+def compress_copy(src: str, dest: str):
+    """Write a Zstandard-compressed copy of src to dest (needs COMPRESSION_AVAILABLE)"""
+    with open(src, 'rb') as fin, open(dest, 'wb') as fout:
+        zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(fin, fout)
+
+
+def parse_json(data: bytes):
+    """Parse JSON text (bytes or str) into plain dicts and lists"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path: str):
+    """Parse a JSON file into plain dicts and lists"""
+    with open_json_stream(path) as f:
+        return parse_json(f.read())
+
+
+@functools.lru_cache(maxsize=8)
+def _load_products(path: str, mtime: float) -> List[dict]:
+    if should_stream(path):
+        # Stream the products instead of holding the raw text and the parsed tree at once
+        with open_json_stream(path) as f:
+            return list(ijson.items(f, 'products.item', use_float=True))
+    return load_json(path).get('products', [])
+
+
+def load_products_cached(path: str) -> List[dict]:
+    """The 'products' list of a scrape JSON file, parsed once per file version
+
+    Results are cached on (path, modification time), so loading the same
+    unchanged file again in this process skips the parse. The list is shared
+    between callers and must not be modified.
+    """
+    return _load_products(path, os.path.getmtime(path))
@@ -2,13 +2,47 @@
 Product name normalization and matching utilities
 """
 import re
+import functools
 from typing import Optional, Tuple
 
+# normalize_product_name
+_BRACKETS_RE = re.compile(r'\s*(\(.*?\)|\[.*?\])')
+_DASH_RE = re.compile(r'\s*-\s*')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
 
+# Common brand patterns (extract_brand_and_product)
+_BRAND_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'^(nestle|nestlé)\s+',
+    r'^(kellogg\'?s?)\s+',
+    r'^(kraft)\s+',
+    r'^(coca.?cola|pepsi)\s+',
+    r'^(campbell\'?s?)\s+',
+    r'^(heinz)\s+',
+    r'^(unilever)\s+',
+    r'^(danone|dannon)\s+',
+    r'^(general.?mills)\s+',
+    r'^(conagra)\s+',
+))
+
+# Pattern: number followed by unit (L, ml, g, kg, oz, lb, etc.), with the
+# unit reported for it (extract_size_and_unit)
+_SIZE_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), unit) for pattern, unit in (
+    (r'(\d+\.?\d*)\s*(ml|milliliter|millilitre)', 'ml'),
+    (r'(\d+\.?\d*)\s*(l|liter|litre)', 'L'),
+    (r'(\d+\.?\d*)\s*(g|gram|grams)', 'g'),
+    (r'(\d+\.?\d*)\s*(kg|kilogram|kilograms)', 'kg'),
+    (r'(\d+\.?\d*)\s*(oz|ounce|ounces)', 'oz'),
+    (r'(\d+\.?\d*)\s*(lb|pound|pounds)', 'lb'),
+    (r'(\d+)\s*(pack|packs|ct|count)', 'pack'),
+))
+
+
+@functools.lru_cache(maxsize=1 << 16)
 def normalize_product_name(name: str) -> str:
     """
     Normalize product name for matching across stores
     Removes extra spaces, converts to lowercase, removes special chars
+    Memoized: the same names are normalized again and again while matching
     """
     if not name:
         return ""
@@ -17,14 +51,14 @@ def normalize_product_name(name: str) -> str:
     normalized = name.lower()
     
     # Remove common prefixes/suffixes that stores might add
-    normalized = re.sub(r'\s*(\(.*?\)|\[.*?\])', '', normalized)  # Remove brackets
-    normalized = re.sub(r'\s*-\s*', ' ', normalized)  # Normalize dashes
+    normalized = _BRACKETS_RE.sub('', normalized)  # Remove brackets
+    normalized = _DASH_RE.sub(' ', normalized)  # Normalize dashes
     
     # Remove extra whitespace
     normalized = ' '.join(normalized.split())
     
     # Remove special characters but keep alphanumeric and spaces
-    normalized = re.sub(r'[^\w\s]', '', normalized)
+    normalized = _NON_WORD_RE.sub('', normalized)
     
     return normalized.strip()
 
@@ -37,23 +71,9 @@ def extract_brand_and_product(name: str) -> Tuple[Optional[str], str]:
     if not name:
         return None, ""
     
-    # Common brand patterns
-    brand_patterns = [
-        r'^(nestle|nestlé)\s+',
-        r'^(kellogg\'?s?)\s+',
-        r'^(kraft)\s+',
-        r'^(coca.?cola|pepsi)\s+',
-        r'^(campbell\'?s?)\s+',
-        r'^(heinz)\s+',
-        r'^(unilever)\s+',
-        r'^(danone|dannon)\s+',
-        r'^(general.?mills)\s+',
-        r'^(conagra)\s+',
-    ]
-    
     name_lower = name.lower()
-    for pattern in brand_patterns:
-        match = re.match(pattern, name_lower, re.IGNORECASE)
+    for pattern in _BRAND_PATTERNS:
+        match = pattern.match(name_lower)
         if match:
             brand = match.group(1).title()
             product = name[match.end():].strip()
@@ -81,20 +101,9 @@ def extract_size_and_unit(name: str) -> Tuple[Optional[str], Optional[str]]:
     if not name:
         return None, None
     
-    # Pattern: number followed by unit (L, ml, g, kg, oz, lb, etc.)
-    patterns = [
-        (r'(\d+\.?\d*)\s*(ml|milliliter|millilitre)', 'ml'),
-        (r'(\d+\.?\d*)\s*(l|liter|litre)', 'L'),
-        (r'(\d+\.?\d*)\s*(g|gram|grams)', 'g'),
-        (r'(\d+\.?\d*)\s*(kg|kilogram|kilograms)', 'kg'),
-        (r'(\d+\.?\d*)\s*(oz|ounce|ounces)', 'oz'),
-        (r'(\d+\.?\d*)\s*(lb|pound|pounds)', 'lb'),
-        (r'(\d+)\s*(pack|packs|ct|count)', 'pack'),
-    ]
-    
     name_lower = name.lower()
-    for pattern, unit in patterns:
-        match = re.search(pattern, name_lower, re.IGNORECASE)
+    for pattern, unit in _SIZE_PATTERNS:
+        match = pattern.search(name_lower)
         if match:
             size = match.group(1)
             return size, unit
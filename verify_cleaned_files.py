@@ -2,38 +2,44 @@
 Verify that cleaned files don't contain products from JSON or duplicates
 """
 import pandas as pd
-import json
+from utils.json_loader import load_products_cached
 
 # Load JSON products
-with open('walmart_scraped_products_20260109_074637.json', 'r', encoding='utf-8') as f:
-    json_data = json.load(f)
-json_products = {p['product_name'].strip() for p in json_data['products']}
-
-# Load cleaned spreadsheet
-df = pd.read_excel('WebsiteScrapper 2_cleaned.ods', engine='odf')
-
-# Find product column
-product_column = None
-for col in df.columns:
-    if 'product' in col.lower() or 'name' in col.lower():
-        product_column = col
-        break
-if product_column is None:
-    product_column = df.columns[0]
+json_products = frozenset(p['product_name'].strip()
+                          for p in load_products_cached('walmart_scraped_products_20260109_074637.json'))
+
+# Load cleaned spreadsheet - only the product column, as text (no type inference)
+CLEANED_SPREADSHEET = 'WebsiteScrapper 2_cleaned.ods'
+_picked_columns = []
+
+
+def is_product_column(col) -> bool:
+    """usecols filter: accepts the first column named like a product/name column"""
+    if not _picked_columns and ('product' in col.lower() or 'name' in col.lower()):
+        _picked_columns.append(col)
+        return True
+    return False
+
+
+df = pd.read_excel(CLEANED_SPREADSHEET, engine='odf', usecols=is_product_column, dtype=str)
+if df.columns.empty:
+    # No product/name column: use the first column
+    df = pd.read_excel(CLEANED_SPREADSHEET, engine='odf', usecols=[0], dtype=str)
+product_column = df.columns[0]
 
 print("=" * 70)
 print("VERIFICATION REPORT")
 print("=" * 70)
 
+# Non-empty product names of the cleaned spreadsheet, indexed by row
+product_names = df[product_column].dropna().astype(str).str.strip()
+product_names = product_names[product_names != '']
+
 # Check for JSON products in cleaned spreadsheet
-spreadsheet_products = set()
-json_matches_in_spreadsheet = []
-for idx, row in df.iterrows():
-    product_name = str(row[product_column]).strip() if pd.notna(row[product_column]) else ""
-    if product_name:
-        spreadsheet_products.add(product_name)
-        if product_name in json_products:
-            json_matches_in_spreadsheet.append((idx + 1, product_name))
+spreadsheet_products = set(product_names)
+in_json = product_names.isin(json_products)
+json_matches_in_spreadsheet = list(zip((product_names.index[in_json] + 1).tolist(),
+                                       product_names[in_json].tolist()))
 
 print(f"\nCleaned Spreadsheet:")
 print(f"  Total rows: {len(df)}")
@@ -49,13 +55,8 @@ else:
 
 # Check for duplicates in cleaned spreadsheet
 from collections import Counter
-product_counts = Counter()
-for idx, row in df.iterrows():
-    product_name = str(row[product_column]).strip() if pd.notna(row[product_column]) else ""
-    if product_name:
-        product_counts[product_name] += 1
-
-duplicates = {k: v for k, v in product_counts.items() if v > 1}
+product_counts = product_names.value_counts(sort=False)  # first-seen order, like Counter
+duplicates = product_counts[product_counts > 1].to_dict()
 print(f"\n  Duplicates in cleaned spreadsheet: {len(duplicates)}")
 
 if duplicates:
@@ -66,14 +67,13 @@ else:
     print("  [OK] No duplicates found in cleaned spreadsheet")
 
 # Check cleaned JSON
-with open('walmart_scraped_products_20260109_074637_cleaned.json', 'r', encoding='utf-8') as f:
-    cleaned_json = json.load(f)
+cleaned_products = load_products_cached('walmart_scraped_products_20260109_074637_cleaned.json')
 
-json_product_names = [p['product_name'].strip() for p in cleaned_json['products']]
+json_product_names = [p['product_name'].strip() for p in cleaned_products]
 json_duplicates = {k: v for k, v in Counter(json_product_names).items() if v > 1}
 
 print(f"\nCleaned JSON:")
-print(f"  Total products: {len(cleaned_json['products'])}")
+print(f"  Total products: {len(cleaned_products)}")
 print(f"  Unique products: {len(set(json_product_names))}")
 print(f"  Duplicates: {len(json_duplicates)}")
 
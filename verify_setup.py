@@ -1,68 +1,182 @@
 """
 Verify that backup and duplicate prevention are working
 """
-import json
 import os
 import sys
+import mmap
+import hashlib
+from utils.json_loader import JSON_SUFFIXES, load_json, open_json_stream, parse_json, should_stream
 
-if sys.platform == 'win32':
-    sys.stdout.reconfigure(encoding='utf-8')
-
-print("=" * 70)
-print("SCRAPER SETUP VERIFICATION")
-print("=" * 70)
-print()
-
-# Check current file
-json_file = 'walmart_scraped_products_20260109_074637.json'
-if os.path.exists(json_file):
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    products = data.get('products', [])
-    product_names = [p.get('product_name') for p in products if p.get('product_name')]
-    unique_names = set(product_names)
+try:
+    import ijson
+except ImportError:  # optional: without it the whole file is loaded
+    ijson = None
+
+try:
+    import simdjson
+except ImportError:  # optional: without it smaller files go through load_json
+    simdjson = None
+
+# Duplicate names are found through 64-bit digests of the names, so the
+# seen set holds small ints rather than every name; True compares the
+# names themselves (no chance of a digest collision)
+EXACT_NAME_DEDUP = False
+
+# Fixed parts of the report, built once
+BAR = "=" * 70
+HEADER = f"{BAR}\nSCRAPER SETUP VERIFICATION\n{BAR}\n\n"
+FOOTER = (
+    "4. Code Features:\n"
+    "   Backup creation: ENABLED (before each save)\n"
+    "   Duplicate prevention: ENABLED (by product_name)\n"
+    "   Safety checks: ENABLED (aborts if data loss detected)\n"
+    "   Atomic writes: ENABLED (temp file then rename)\n"
+    "\n"
+    f"{BAR}\nSUMMARY\n{BAR}\n"
+    "All systems are ready!\n"
+    "- Backups will be created automatically\n"
+    "- Only unique products will be stored\n"
+    "- Data loss protection is active\n"
+    "\n"
+)
+
+def iter_product_names(path):
+    """product_name of each product in the file, None where it has none.
+
+    Large files are streamed with ijson, keeping only the product_name
+    strings; the product dicts are never built. Smaller ones are parsed with
+    simdjson when it is installed, which only converts the fields read here.
+    """
+    if not should_stream(path):
+        if simdjson is not None:
+            # The parsed document lives in the parser, so keep it referenced here
+            parser = simdjson.Parser()
+            with open_json_stream(path) as f:
+                products = parser.parse(f.read()).get('products', [])
+        else:
+            products = load_json(path).get('products', [])
+        for product in products:
+            yield product.get('product_name')
+        return
     
-    print("1. Current JSON File:")
-    print(f"   Total products: {len(products)}")
-    print(f"   Unique product names: {len(unique_names)}")
-    print(f"   Duplicates: {len(products) - len(unique_names)}")
-    if len(products) == len(unique_names):
-        print("   Status: OK - No duplicates")
+    with open_json_stream(path) as f:
+        name = None
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'products.item':
+                if event == 'start_map':
+                    name = None
+                elif event == 'end_map':
+                    yield name
+            elif prefix == 'products.item.product_name' and event == 'string':
+                name = value
+
+
+def name_digest(name: str) -> int:
+    """64-bit BLAKE2b digest of a product name"""
+    return int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def count_product_names(path):
+    """Number of products, of distinct non-empty names, and of repeated names"""
+    total = duplicates = 0
+    seen = set()
+    for name in iter_product_names(path):
+        total += 1
+        if not name:
+            continue
+        key = name if EXACT_NAME_DEDUP else name_digest(name)
+        if key in seen:
+            duplicates += 1
+        else:
+            seen.add(key)
+    return total, len(seen), duplicates
+
+
+def count_journal(path):
+    """Number of entries in a JSONL results journal and of distinct product names in it.
+
+    Lines are read from an mmap of the file and each complete line is parsed
+    once; only the product name key is kept, not the line itself.
+    """
+    total = 0
+    names = set()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                if not line.endswith(b'\n'):  # skip a last line still being written
+                    continue
+                total += 1
+                try:
+                    name = parse_json(line).get('product_name')
+                except ValueError:
+                    continue
+                if name:
+                    names.add(name if EXACT_NAME_DEDUP else name_digest(name))
+    return total, len(names)
+
+
+def verify(json_file: str = 'walmart_scraped_products_20260109_074637.json'):
+    """Print the setup report for json_file and the backups directory"""
+    sys.stdout.write(HEADER)
+
+    # Check current file
+    if os.path.exists(json_file):
+        total, unique, duplicates = count_product_names(json_file)
+        
+        print("1. Current JSON File:")
+        print(f"   Total products: {total}")
+        print(f"   Unique product names: {unique}")
+        print(f"   Duplicates: {duplicates}")
+        if not duplicates:
+            print("   Status: OK - No duplicates")
+        else:
+            print(f"   Status: WARNING - {duplicates} duplicates found!")
+        print()
     else:
-        print(f"   Status: WARNING - {len(products) - len(unique_names)} duplicates found!")
+        print("1. Current JSON File: Not found (will be created)")
+        print()
+
+    # Results scrape_walmart_parallel.py has journaled but not yet merged into
+    # the file (present during a run, or after one was interrupted)
+    journal_file = json_file + '.jsonl'
+    if os.path.exists(journal_file):
+        entries, journaled = count_journal(journal_file)
+        print("2. Results Journal (not yet merged):")
+        print(f"   Entries: {entries}")
+        print(f"   Distinct products: {journaled}")
+    else:
+        print("2. Results Journal: None pending (all results merged into the JSON file)")
     print()
-else:
-    print("1. Current JSON File: Not found (will be created)")
+
+    # Check backup system
+    print("3. Backup System:")
+    backup_dir = os.path.join('.', 'backups')
+    if os.path.exists(backup_dir):
+        # Count the backups (plain or .json.zst) and find the latest name in one directory scan
+        backup_count = 0
+        latest_backup = None
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(JSON_SUFFIXES) and entry.is_file():
+                    backup_count += 1
+                    if latest_backup is None or entry.name > latest_backup:
+                        latest_backup = entry.name
+        print(f"   Backups directory: EXISTS")
+        print(f"   Backup files: {backup_count}")
+        if latest_backup:
+            print(f"   Latest backup: {latest_backup}")
+    else:
+        print(f"   Backups directory: Will be created on first save")
+        print("   Status: OK - Backup system is ready")
     print()
 
-# Check backup system
-print("2. Backup System:")
-backup_dir = os.path.join('.', 'backups')
-if os.path.exists(backup_dir):
-    backup_files = [f for f in os.listdir(backup_dir) if f.endswith('.json')]
-    print(f"   Backups directory: EXISTS")
-    print(f"   Backup files: {len(backup_files)}")
-    if backup_files:
-        print(f"   Latest backup: {sorted(backup_files, reverse=True)[0]}")
-else:
-    print(f"   Backups directory: Will be created on first save")
-    print("   Status: OK - Backup system is ready")
-print()
-
-# Check code features
-print("3. Code Features:")
-print("   Backup creation: ENABLED (before each save)")
-print("   Duplicate prevention: ENABLED (by product_name)")
-print("   Safety checks: ENABLED (aborts if data loss detected)")
-print("   Atomic writes: ENABLED (temp file then rename)")
-print()
-
-print("=" * 70)
-print("SUMMARY")
-print("=" * 70)
-print("All systems are ready!")
-print("- Backups will be created automatically")
-print("- Only unique products will be stored")
-print("- Data loss protection is active")
-print()
+    # Code features and summary
+    sys.stdout.write(FOOTER)
+
 
+if __name__ == '__main__':
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    verify()
@@ -1,46 +1,120 @@
 """View Walmart scraping results in a readable format"""
-import json
-import glob
 import os
+import sys
+from utils.json_loader import load_json, open_json_stream, should_stream
 
-# Find the most recent result file
-result_files = glob.glob("walmart_scraped_products_*.json")
-if result_files:
-    latest = max(result_files, key=os.path.getctime)
-    print(f"Showing results from: {latest}\n")
-    
-    with open(latest, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    print("=" * 80)
-    print("WALMART SCRAPING RESULTS")
-    print("=" * 80)
-    print(f"Total Products Searched: {data['total_products']}")
-    print(f"Products Found: {data['products_found']}")
-    print(f"Scraped At: {data['scraped_at']}")
-    print("=" * 80)
-    
-    print("\nPRODUCT DETAILS:")
-    print("-" * 80)
+try:
+    import ijson
+except ImportError:  # optional: without it the whole file is loaded
+    ijson = None
+
+# Top-level fields shown above the products (written before the product list)
+SUMMARY_KEYS = ('total_products', 'products_found', 'scraped_at')
+
+# Fields shown for a found product, in display order
+DETAIL_KEYS = ('walmart_product_name', 'walmart_price', 'walmart_brand',
+               'walmart_size', 'walmart_in_stock', 'walmart_url')
+
+# Report text for one product: number and name, then the DETAIL_KEYS values
+FOUND_TEMPLATE = (
+    "\n{}. {}\n" + "-" * 80 + "\n"
+    "   [FOUND] on Walmart\n"
+    "   Walmart Product: {}\n"
+    "   Price: ${}\n"
+    "   Brand: {}\n"
+    "   Size: {}\n"
+    "   In Stock: {}\n"
+    "   URL: {:.70}..."
+)
+NOT_FOUND_TEMPLATE = "\n{}. {}\n" + "-" * 80 + "\n   [NOT FOUND] on Walmart"
+ERROR_TEMPLATE = "\n   Error: {}"
+
+# Products formatted before each write to stdout
+PRINT_BATCH = 256
+
+
+def latest_result_file():
+    """Most recently created walmart_scraped_products_*.json here, found in one directory scan"""
+    with os.scandir('.') as entries:
+        latest = max(
+            (entry for entry in entries
+             if entry.name.startswith('walmart_scraped_products_') and entry.name.endswith('.json')),
+            key=lambda entry: entry.stat().st_ctime,
+            default=None,
+        )
+    return latest.name if latest else None
+
+
+def _stream_products(path):
+    with open_json_stream(path) as f:
+        yield from ijson.items(f, 'products.item', use_float=True)
+
+
+def open_results(path):
+    """The file's summary fields and an iterable of its products.
+
+    Large files are streamed with ijson: the summary is read from the top of
+    the file and the products one at a time, so only the product being
+    printed is in memory.
+    """
+    if not should_stream(path):
+        data = load_json(path)
+        return data, data['products']
     
-    for i, product in enumerate(data['products'], 1):
-        print(f"\n{i}. {product['product_name']}")
+    summary = {}
+    with open_json_stream(path) as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix in SUMMARY_KEYS:
+                summary[prefix] = value
+                if len(summary) == len(SUMMARY_KEYS):
+                    break
+    return summary, _stream_products(path)
+
+
+def view(path: str = None):
+    """Print the results in path (default: the latest result file here)"""
+    # Default to the most recent result file
+    if path is None:
+        path = latest_result_file()
+    if path:
+        print(f"Showing results from: {path}\n")
+        
+        data, products = open_results(path)
+        
+        print("=" * 80)
+        print("WALMART SCRAPING RESULTS")
+        print("=" * 80)
+        print(f"Total Products Searched: {data['total_products']}")
+        print(f"Products Found: {data['products_found']}")
+        print(f"Scraped At: {data['scraped_at']}")
+        print("=" * 80)
+        
+        print("\nPRODUCT DETAILS:")
         print("-" * 80)
         
-        if product.get('found'):
-            print(f"   [FOUND] on Walmart")
-            print(f"   Walmart Product: {product.get('walmart_product_name', 'N/A')}")
-            print(f"   Price: ${product.get('walmart_price', 'N/A')}")
-            print(f"   Brand: {product.get('walmart_brand', 'N/A')}")
-            print(f"   Size: {product.get('walmart_size', 'N/A')}")
-            print(f"   In Stock: {product.get('walmart_in_stock', 'N/A')}")
-            print(f"   URL: {product.get('walmart_url', 'N/A')[:70]}...")
-        else:
-            print(f"   [NOT FOUND] on Walmart")
-            if product.get('error'):
-                print(f"   Error: {product['error']}")
-    
-    print("\n" + "=" * 80)
-else:
-    print("No result files found. Run scrape_walmart_from_spreadsheet.py first!")
+        # Product blocks are written PRINT_BATCH products at a time
+        blocks = []
+        for i, product in enumerate(products, 1):
+            get = product.get
+            if get('found'):
+                blocks.append(FOUND_TEMPLATE.format(
+                    i, product['product_name'], *[get(key, 'N/A') for key in DETAIL_KEYS]
+                ))
+            else:
+                block = NOT_FOUND_TEMPLATE.format(i, product['product_name'])
+                error = get('error')
+                blocks.append(block + ERROR_TEMPLATE.format(error) if error else block)
+            
+            if i % PRINT_BATCH == 0:
+                sys.stdout.write('\n'.join(blocks) + '\n')
+                blocks.clear()
+        if blocks:
+            sys.stdout.write('\n'.join(blocks) + '\n')
+        
+        print("\n" + "=" * 80)
+    else:
+        print("No result files found. Run scrape_walmart_from_spreadsheet.py first!")
+
 
+if __name__ == '__main__':
+    view()